@@ -0,0 +1,116 @@
+"""
+Benchmark of LLMClient call profiles.
+
+Sends the same sample requests with the old hard-coded settings and with the current
+CALL_PROFILES, and prints latency and output size per call type.
+
+Usage (from the repository root):
+    python benchmarks/call_profiles.py --runs 10
+    python benchmarks/call_profiles.py --base-url http://127.0.0.1:8000 --api-key sk-test
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.config as config  # noqa: E402
+
+# Settings every call type used before call profiles existed
+LEGACY_SETTINGS = {
+    "scenario_response": dict(max_tokens=150, temperature=0.7),
+    "goal_evaluation": dict(max_tokens=150, temperature=0.7),
+    "turn_evaluation": dict(max_tokens=150, temperature=0.1),
+    "extraction": dict(max_tokens=100, temperature=0.1),
+    "correction": dict(max_tokens=100, temperature=0.7),
+}
+
+SAMPLE_HISTORY = [
+    {"role": "assistant", "content": "Hallo! Hoe heet je?"},
+    {"role": "user", "content": "Hallo, ik ben Ana en ik ben 23 jaar."},
+]
+SAMPLE_CONCEPTS = {"L01_V01": "hallo", "L01_E01": "Ik heet ...", "L01_E02": "Ik ben ... jaar"}
+SAMPLE_GOAL = "Introduce yourself"
+SAMPLE_EXTRACT_INFO = {"user_name": "The user's name", "age": "The user's age"}
+
+
+def build_messages(call_type):
+    from src.prompt_compiler import prompt_compiler
+
+    if call_type == "scenario_response":
+        return [{"role": "system", "content": prompt_compiler.compile("scenario", concepts=SAMPLE_CONCEPTS)}] + SAMPLE_HISTORY
+    if call_type == "goal_evaluation":
+        return [{"role": "system", "content": prompt_compiler.compile("goal_evaluation", goal=SAMPLE_GOAL)}] + SAMPLE_HISTORY
+    if call_type == "turn_evaluation":
+        system_prompt = prompt_compiler.compile("turn_evaluation", goal=SAMPLE_GOAL, extract_info=SAMPLE_EXTRACT_INFO)
+        return [{"role": "system", "content": system_prompt}] + SAMPLE_HISTORY
+    if call_type == "extraction":
+        system_prompt = prompt_compiler.compile("extraction", extract_info=SAMPLE_EXTRACT_INFO)
+        return [{"role": "system", "content": system_prompt}, SAMPLE_HISTORY[-1]]
+    return [
+        {"role": "system", "content": prompt_compiler.compile("correction")},
+        {"role": "user", "content": "The question was: 'How do you say hello?'. My answer was: 'Hallo'."},
+    ]
+
+
+def measure(client, messages, profile, runs):
+    from src.utils.async_runner import llm_runner
+
+    latencies, sizes, failures = [], [], 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        try:
+            text = llm_runner.run(client._complete(messages, profile))
+        except Exception as e:
+            failures += 1
+            print(f"  request failed: {e}")
+            continue
+        latencies.append(time.perf_counter() - started)
+        sizes.append(len(text or ""))
+    return latencies, sizes, failures
+
+
+def summarize(label, latencies, sizes, failures):
+    if not latencies:
+        return f"{label:<8} all requests failed"
+    p95 = sorted(latencies)[max(0, int(round(0.95 * (len(latencies) - 1))))]
+    return (f"{label:<8} p50 {statistics.median(latencies) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms   "
+            f"output {statistics.mean(sizes):6.1f} chars   failures {failures}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--base-url", help="OpenAI-compatible endpoint (defaults to config.BASE_URL)")
+    parser.add_argument("--api-key", help="API key (defaults to the configured key)")
+    parser.add_argument("--call-type", action="append", help="Limit the benchmark to these call types")
+    args = parser.parse_args()
+
+    if args.base_url:
+        config.BASE_URL = args.base_url
+    if args.api_key:
+        config.update_runtime_api_key(args.api_key)
+
+    from src.llm_client import CallProfile, LLMClient, get_call_profile
+
+    client = LLMClient()
+    if client.validation_pending:
+        client._apply_validation(config.get_effective_api_key(), client.validate_api_key())
+    if not client.active:
+        print("No LLM backend available; set an API key or --base-url")
+        return 1
+
+    for call_type in args.call_type or LEGACY_SETTINGS:
+        messages = build_messages(call_type)
+        print(f"\n{call_type}")
+        legacy = measure(client, messages, CallProfile(name=call_type, **LEGACY_SETTINGS[call_type]), args.runs)
+        print(summarize("legacy", *legacy))
+        current = measure(client, messages, get_call_profile(call_type), args.runs)
+        print(summarize("profile", *current))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
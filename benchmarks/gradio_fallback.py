@@ -0,0 +1,107 @@
+"""
+Benchmark of LLMClient's Gradio fallback, fully offline.
+
+Starts benchmarks/mock_llm_server.py in this process, points both the DeepSeek endpoint and
+LLM_GRADIO_SPACE at it and uses an API key the mock rejects, so LLMClient falls back to
+gradio_client exactly as it does when a user's key is refused. It then times the Gradio
+connection (config/info discovery) and goal evaluations, blocking and streamed.
+
+Usage (from the repository root):
+    python benchmarks/gradio_fallback.py --runs 20
+    python benchmarks/gradio_fallback.py --runs 20 --latency lognormal:0.5,0.4 --token-delay 0.02
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import mock_llm_server  # noqa: E402
+import src.config as config  # noqa: E402
+
+SAMPLE_HISTORY = [
+    {"role": "assistant", "content": "Hallo! Hoe heet je?"},
+    {"role": "user", "content": "Hallo, ik ben Ana."},
+]
+SAMPLE_GOAL = "Introduce yourself"
+
+
+def summarize(label, latencies):
+    p95 = sorted(latencies)[max(0, int(round(0.95 * (len(latencies) - 1))))]
+    return f"{label:<11} p50 {statistics.median(latencies) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms"
+
+
+async def stream_once(client):
+    """Seconds to the first chunk and to the end of a streamed goal evaluation."""
+    started = time.perf_counter()
+    first_chunk = None
+    text = ""
+    async for delta in client.stream_goal_evaluation(SAMPLE_HISTORY, SAMPLE_GOAL):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        text += delta
+    if not text.startswith("GOAL_ACHIEVED:"):
+        raise RuntimeError(f"unexpected streamed answer: {text!r}")
+    return first_chunk, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency", default="fixed:0.1", help="mock time to first byte (mock_llm_server syntax)")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="mock seconds between streamed tokens")
+    args = parser.parse_args()
+
+    server, url = mock_llm_server.start_in_background(
+        ["--api-key", "sk-mock", "--latency", args.latency, "--token-delay", str(args.token_delay)]
+    )
+    config.BASE_URL = url
+    config.GRADIO_SPACE = url
+    config.LOCAL_LLM_BASE_URL = None
+    config.update_runtime_api_key("sk-rejected")
+
+    import src.llm_client as llm_client
+
+    client = llm_client.LLMClient()
+    client._apply_validation(config.get_effective_api_key(), client.validate_api_key())
+    status = client.get_api_status()
+    if not status["using_gradio"]:
+        print(f"Expected the Gradio fallback, got {status}")
+        return 1
+
+    started = time.perf_counter()
+    if llm_client._get_gradio_client() is None:
+        print(f"gradio_client could not connect to {url}")
+        return 1
+    print(f"Gradio fallback at {url}: connected in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    blocking = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        response = client.evaluate_goal_completion(SAMPLE_HISTORY, SAMPLE_GOAL)
+        blocking.append(time.perf_counter() - started)
+        if not response.startswith("GOAL_ACHIEVED:"):
+            print(f"Unexpected answer: {response!r}")
+            return 1
+    print(summarize("blocking", blocking))
+
+    first_chunks, streamed = [], []
+    for _ in range(args.runs):
+        first_chunk, total = asyncio.run(stream_once(client))
+        first_chunks.append(first_chunk)
+        streamed.append(total)
+    print(summarize("first chunk", first_chunks))
+    print(summarize("streamed", streamed))
+
+    print(f"\nmock requests: {server.RequestHandlerClass.behaviour.stats}")
+    print(f"router: {status['backend_order']} -> gradio {client.get_api_status()['backends'].get('gradio')}")
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,509 @@
+"""
+Offline stand-in for the LLM backends, for benchmarks and load tests.
+
+Speaks the OpenAI `/chat/completions` API (streaming and non-streaming, also under `/v1`)
+and poses as a Gradio app with a `/chat` endpoint. For `gradio_client.Client` it serves
+the discovery routes (`/config`, `/gradio_api/info`) and the queue protocol
+(`POST /gradio_api/queue/join`, then `GET /gradio_api/queue/data` as server-sent events);
+the plain HTTP call API (`POST /gradio_api/call/chat`, `GET /gradio_api/call/chat/<event_id>`)
+works too. Replies are scripted from the system prompt so every LLMClient call gets a
+well-formed answer:
+
+    goal evaluation      -> GOAL_ACHIEVED: true|false
+    turn evaluation      -> GOAL_ACHIEVED: ... + EXTRACTED: {...}
+    extraction           -> JSON object with the requested keys
+    CONCEPTS_COVERED     -> CONCEPTS_COVERED: [] + reply (older scenario prompts)
+    anything else        -> a short conversational reply
+
+Latency, error injection and custom scripted replies are configurable.
+
+Usage (from the repository root):
+    python benchmarks/mock_llm_server.py --port 8000 --latency lognormal:0.3,0.5 --error-rate 0.05
+    LLM_BASE_URL=http://127.0.0.1:8000 DEEPSEEK_API_KEY=sk-mock python main.py
+    LLM_GRADIO_SPACE=http://127.0.0.1:8000 python main.py   # no key: the Gradio fallback
+"""
+import argparse
+import json
+import math
+import random
+import re
+import select
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class LatencyModel:
+    """Parses "fixed:S", "uniform:A,B", "normal:MEAN,STD" or "lognormal:MEDIAN,SIGMA" (seconds)."""
+
+    def __init__(self, spec: str):
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(value) for value in params.split(",") if value]
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0] if self.params else 0.0
+        if self.kind == "uniform":
+            return random.uniform(self.params[0], self.params[1])
+        if self.kind == "normal":
+            return max(0.0, random.gauss(self.params[0], self.params[1]))
+        median, sigma = self.params
+        return random.lognormvariate(math.log(median), sigma)
+
+
+class MockBehaviour:
+    def __init__(self, args):
+        self.latency = LatencyModel(args.latency)
+        self.token_delay = args.token_delay
+        self.error_rate = args.error_rate
+        self.error_status = args.error_status
+        self.retry_after = args.retry_after
+        self.goal_rate = args.goal_rate
+        self.api_key = args.api_key
+        self.scripts = []
+        if args.script:
+            with open(args.script, "r", encoding="utf-8") as f:
+                self.scripts = [(re.compile(item["match"], re.DOTALL), item["response"]) for item in json.load(f)]
+        self.stats = {"requests": 0, "errors": 0, "streams": 0, "gradio": 0}
+        self.lock = threading.Lock()
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+    def reply(self, messages) -> str:
+        system = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        conversation = "\n".join(f"{m.get('role')}: {m.get('content', '')}" for m in messages)
+        last_user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+
+        for pattern, response in self.scripts:
+            if pattern.search(conversation):
+                return response
+
+        achieved = "true" if random.random() < self.goal_rate else "false"
+        if "EXTRACTED" in system:
+            keys = _example_keys(system)
+            return f"GOAL_ACHIEVED: {achieved}\nEXTRACTED: {json.dumps({key: _guess(key, last_user) for key in keys})}"
+        if "GOAL_ACHIEVED" in system:
+            return f"GOAL_ACHIEVED: {achieved}"
+        if "information extraction" in system or "JSON object" in system:
+            keys = re.findall(r"^- (\w+):", system, re.MULTILINE)
+            return json.dumps({key: _guess(key, last_user) for key in keys})
+        if "CONCEPTS_COVERED" in system:
+            return "CONCEPTS_COVERED: []\nHallo! Wat kan ik voor je doen?"
+        if "language teacher" in system:
+            return "Perfect! Very good answer."
+        return "Hallo! Wat kan ik voor je doen?"
+
+
+def _example_keys(system: str):
+    match = re.search(r"(\{[^{}]*\})\s*$", system)
+    if match:
+        try:
+            return list(json.loads(match.group(1)).keys())
+        except json.JSONDecodeError:
+            pass
+    return re.findall(r"^- (\w+):", system, re.MULTILINE)
+
+
+def _guess(key: str, message: str):
+    """Cheap stand-in extraction so scripted replies look plausible."""
+    if "name" in key:
+        match = re.search(r"\b(?:ik ben|ik heet|my name is|i am|me llamo)\s+(\w+)", message, re.IGNORECASE)
+        return match.group(1) if match else None
+    if "age" in key or "number" in key:
+        match = re.search(r"\d+", message)
+        return int(match.group(0)) if match else None
+    return None
+
+
+def _tokens(text: str):
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def _limit(text: str, max_tokens, stop):
+    for sequence in ([stop] if isinstance(stop, str) else stop or []):
+        index = text.find(sequence)
+        if index != -1:
+            text = text[:index]
+    if max_tokens:
+        text = "".join(_tokens(text)[:max_tokens])
+    return text
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+# The /chat endpoint of the Gradio space LLMClient falls back to: (parameter, component, default)
+GRADIO_CHAT_INPUTS = [
+    ("message", "textbox", None),
+    ("max_new_tokens", "slider", 1024),
+    ("temperature", "slider", 0.6),
+    ("top_p", "slider", 0.9),
+    ("top_k", "slider", 50),
+    ("repetition_penalty", "slider", 1.2),
+]
+GRADIO_API_PREFIX = "/gradio_api"
+
+
+def gradio_config() -> dict:
+    """What gradio_client.Client reads from /config: one queued /chat endpoint over sse_v1."""
+    components = [{"id": index, "type": kind, "props": {"label": name}}
+                  for index, (name, kind, _) in enumerate(GRADIO_CHAT_INPUTS, start=1)]
+    output_id = len(components) + 1
+    components.append({"id": output_id, "type": "textbox", "props": {"label": "Response"}})
+    return {
+        "version": "4.44.1",
+        "mode": "blocks",
+        "protocol": "sse_v1",
+        "api_prefix": GRADIO_API_PREFIX,
+        "connect_heartbeat": False,
+        "components": components,
+        "dependencies": [{
+            "id": 0,
+            "api_name": "chat",
+            "inputs": [component["id"] for component in components[:-1]],
+            "outputs": [output_id],
+            "backend_fn": True,
+            "queue": True,
+            "show_api": True,
+        }],
+    }
+
+
+def gradio_api_info() -> dict:
+    """What gradio_client.Client reads from /gradio_api/info: the /chat parameters and their defaults."""
+    parameters = []
+    for name, kind, default in GRADIO_CHAT_INPUTS:
+        is_text = kind == "textbox"
+        parameters.append({
+            "label": name,
+            "parameter_name": name,
+            "parameter_has_default": default is not None,
+            "parameter_default": default,
+            "type": {"type": "string" if is_text else "number"},
+            "python_type": {"type": "str" if is_text else "float", "description": ""},
+            "component": kind.capitalize(),
+        })
+    returns = [{"label": "Response", "type": {"type": "string"},
+                "python_type": {"type": "str", "description": ""}, "component": "Textbox"}]
+    return {"named_endpoints": {"/chat": {"parameters": parameters, "returns": returns}}, "unnamed_endpoints": {}}
+
+
+class GradioSession:
+    """Queue messages of one gradio_client session, waiting for its /queue/data stream."""
+
+    def __init__(self):
+        self.messages = deque()
+        self.changed = threading.Condition()
+
+    def put(self, message: dict):
+        with self.changed:
+            self.messages.append(message)
+            self.changed.notify_all()
+
+
+class Handler(BaseHTTPRequestHandler):
+    behaviour: MockBehaviour = None
+    gradio_events = {}
+    gradio_sessions = {}
+    gradio_sessions_lock = threading.Lock()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, status: int, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _injected_error(self) -> bool:
+        behaviour = self.behaviour
+        if not behaviour.should_fail():
+            return False
+        behaviour.count("errors")
+        headers = {"Retry-After": str(behaviour.retry_after)} if behaviour.error_status == 429 else None
+        self._json(behaviour.error_status, {"error": {"message": "Injected error", "type": "mock_error"}}, headers)
+        return True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/")
+        if path in ("/models", "/v1/models"):
+            self._json(200, {"object": "list", "data": [{"id": "mock-chat", "object": "model"}]})
+        elif path == "/stats":
+            self._json(200, self.behaviour.stats)
+        elif path == "/config":
+            self._json(200, gradio_config())
+        elif path in (f"{GRADIO_API_PREFIX}/info", "/info"):
+            self._json(200, gradio_api_info())
+        elif path == f"{GRADIO_API_PREFIX}/queue/data":
+            self._gradio_queue_data(parse_qs(url.query).get("session_hash", [""])[0])
+        elif path.startswith("/gradio_api/call/chat/"):
+            self._gradio_result(path.rsplit("/", 1)[-1])
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path.rstrip("/")
+        if path in ("/chat/completions", "/v1/chat/completions"):
+            self._chat_completions()
+        elif path == f"{GRADIO_API_PREFIX}/queue/join":
+            self._gradio_queue_join()
+        elif path in (f"{GRADIO_API_PREFIX}/reset", f"{GRADIO_API_PREFIX}/cancel"):
+            self._read_json()
+            self._json(200, {"success": True})
+        elif path in ("/gradio_api/call/chat", "/call/chat"):
+            self._gradio_submit()
+        else:
+            self._json(404, {"error": "not found"})
+
+    # --- OpenAI-compatible API ---
+
+    def _chat_completions(self):
+        behaviour = self.behaviour
+        behaviour.count("requests")
+        request = self._read_json()
+
+        if behaviour.api_key and self.headers.get("Authorization") != f"Bearer {behaviour.api_key}":
+            self._json(401, {"error": {"message": "Invalid API key", "type": "authentication_error"}})
+            return
+
+        time.sleep(behaviour.latency.sample())
+        if self._injected_error():
+            return
+
+        messages = request.get("messages", [])
+        text = _limit(behaviour.reply(messages), request.get("max_tokens"), request.get("stop"))
+        usage = {
+            "prompt_tokens": sum(_estimate_tokens(m.get("content", "")) for m in messages),
+            "completion_tokens": len(_tokens(text)),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "created": int(time.time()), "model": request.get("model", "mock-chat")}
+
+        if not request.get("stream"):
+            self._json(200, {
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        behaviour.count("streams")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(payload):
+            data = f"data: {payload}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        try:
+            chunk = {**base, "object": "chat.completion.chunk"}
+            send(json.dumps({**chunk, "choices": [{"index": 0, "delta": {"role": "assistant"}, "finish_reason": None}]}))
+            for token in _tokens(text):
+                time.sleep(behaviour.token_delay)
+                send(json.dumps({**chunk, "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}))
+            send(json.dumps({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}))
+            if (request.get("stream_options") or {}).get("include_usage"):
+                send(json.dumps({**chunk, "choices": [], "usage": usage}))
+            send("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client closed the stream early
+
+    # --- Gradio queue protocol (what gradio_client.Client uses) ---
+
+    def _gradio_session(self, session_hash: str) -> GradioSession:
+        with self.gradio_sessions_lock:
+            session = self.gradio_sessions.get(session_hash)
+            if session is None:
+                session = self.gradio_sessions[session_hash] = GradioSession()
+            return session
+
+    def _gradio_queue_join(self):
+        self.behaviour.count("gradio")
+        request = self._read_json()
+        event_id = uuid.uuid4().hex
+        session = self._gradio_session(request.get("session_hash", ""))
+        threading.Thread(target=self._gradio_process, args=(session, event_id, request.get("data", [])), daemon=True).start()
+        self._json(200, {"event_id": event_id})
+
+    def _gradio_process(self, session: GradioSession, event_id: str, data: list):
+        behaviour = self.behaviour
+        session.put({"msg": "process_starts", "event_id": event_id})
+        time.sleep(behaviour.latency.sample())
+        if behaviour.should_fail():
+            behaviour.count("errors")
+            session.put({"msg": "process_completed", "event_id": event_id, "success": False,
+                         "output": {"error": "Injected error"}})
+            return
+        prompt = data[0] if data else ""
+        text = self._gradio_reply(prompt, data[1] if len(data) > 1 else None)
+        produced = ""
+        for token in _tokens(text):
+            time.sleep(behaviour.token_delay)
+            produced += token
+            # sse_v1 sends whole (cumulative) values, like the real space streams its text
+            session.put({"msg": "process_generating", "event_id": event_id, "success": True,
+                         "output": {"data": [produced]}})
+        session.put({"msg": "process_completed", "event_id": event_id, "success": True, "output": {"data": [text]}})
+
+    def _gradio_queue_data(self, session_hash: str):
+        session = self._gradio_session(session_hash)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        # The client ends the stream once none of its events are pending. Check for that before
+        # taking each message, so a message meant for its next stream isn't lost on this one.
+        while True:
+            with session.changed:
+                session.changed.wait_for(lambda: session.messages, timeout=0.1)
+                if self._client_gone():
+                    return
+                if not session.messages:
+                    continue
+                message = session.messages.popleft()
+            try:
+                self.wfile.write(f"data: {json.dumps(message)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                with session.changed:
+                    session.messages.appendleft(message)
+                    session.changed.notify_all()
+                return
+
+    def _client_gone(self) -> bool:
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return self.connection.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def _gradio_reply(self, prompt: str, max_tokens) -> str:
+        # The space receives one formatted prompt; recover the system part for the script
+        system, _, rest = prompt.partition("\n\n")
+        messages = [{"role": "system", "content": system.removeprefix("System: ")}, {"role": "user", "content": rest}]
+        return _limit(self.behaviour.reply(messages), max_tokens, None)
+
+    # --- Gradio /chat call API ---
+
+    def _gradio_submit(self):
+        behaviour = self.behaviour
+        behaviour.count("gradio")
+        request = self._read_json()
+        # Gradio passes positional inputs: message, max_new_tokens, temperature, ...
+        data = request.get("data", [])
+        prompt = data[0] if data else ""
+        max_tokens = data[1] if len(data) > 1 else None
+        event_id = uuid.uuid4().hex
+        self.gradio_events[event_id] = (prompt, max_tokens)
+        self._json(200, {"event_id": event_id})
+
+    def _gradio_result(self, event_id: str):
+        behaviour = self.behaviour
+        event = self.gradio_events.pop(event_id, None)
+        if event is None:
+            self._json(404, {"error": "unknown event"})
+            return
+        prompt, max_tokens = event
+
+        time.sleep(behaviour.latency.sample())
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        if behaviour.should_fail():
+            behaviour.count("errors")
+            self.wfile.write(b"event: error\ndata: null\n\n")
+            return
+
+        text = self._gradio_reply(prompt, max_tokens)
+        # Like the real space, intermediate outputs are cumulative
+        produced = ""
+        for token in _tokens(text):
+            time.sleep(behaviour.token_delay)
+            produced += token
+            self.wfile.write(f"event: generating\ndata: {json.dumps([produced])}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(f"event: complete\ndata: {json.dumps([text])}\n\n".encode("utf-8"))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", default="fixed:0.1",
+                        help="time to first byte: fixed:S, uniform:A,B, normal:MEAN,STD or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected errors")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After seconds sent with 429 errors")
+    parser.add_argument("--goal-rate", type=float, default=0.7, help="probability of GOAL_ACHIEVED: true")
+    parser.add_argument("--api-key", help="require this bearer token (401 otherwise)")
+    parser.add_argument("--script", help='JSON file of [{"match": regex, "response": text}] checked first')
+    parser.add_argument("--seed", type=int, help="random seed for reproducible runs")
+    return parser
+
+
+def create_server(args) -> ThreadingHTTPServer:
+    """Builds the server for parsed arguments; --port 0 picks a free port (see server.server_port)."""
+    if args.seed is not None:
+        random.seed(args.seed)
+    Handler.behaviour = MockBehaviour(args)
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(argv=()) -> tuple:
+    """Runs a mock server in a daemon thread of this process, for benchmarks and tests. Returns (server, url)."""
+    server = create_server(build_parser().parse_args(["--port", "0", *argv]))
+    threading.Thread(target=server.serve_forever, name="mock-llm-server", daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    args = build_parser().parse_args()
+    server = create_server(args)
+    print(f"Mock LLM server on http://{args.host}:{server.server_port} (latency {args.latency}, error rate {args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark of user_data.json writes per slide turn.
+
+Runs LessonState.next_slide() against a temporary user data file and counts file writes:
+
+    legacy        one write per set_progress call (what save_progress did before batch())
+    batched       save_progress() inside UserDataManager.batch(), written synchronously
+    write-behind  batched plus the background writer coalescing turns within its window
+
+It also times a single flush (temp file, fsync, rename, .bak rotation) against the plain
+truncating write it replaced.
+
+Usage (from the repository root):
+    python benchmarks/user_data_writes.py --turns 50
+    python benchmarks/user_data_writes.py --turns 50 --turn-interval 0.1 --write-delay 0.5
+"""
+import argparse
+import atexit
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.managers.progress_manager as progress_module  # noqa: E402
+from src.managers.progress_manager import ProgressManager  # noqa: E402
+from src.managers.user_data_manager import UserDataManager  # noqa: E402
+from src.state.lesson_state import LessonState  # noqa: E402
+
+
+class SampleLessons:
+    """Just enough of DataManager for LessonState: one long lesson."""
+
+    def __init__(self, slides: int):
+        self.content = [{"type": "vocabulary"} for _ in range(slides)]
+
+    def get_lesson_content(self, lesson_id):
+        return self.content
+
+
+class UnbatchedUserDataManager(UserDataManager):
+    """Ignores batch(), so every set_progress call is its own write as before."""
+
+    @contextmanager
+    def batch(self):
+        yield self
+
+
+def run(manager_class, turns: int, write_delay: float, turn_interval: float):
+    with tempfile.TemporaryDirectory() as folder:
+        manager = manager_class(os.path.join(folder, "user_data.json"), write_delay=write_delay)
+        progress_module.user_data_manager = manager
+        try:
+            lesson_state = LessonState(SampleLessons(turns + 1), ProgressManager())
+            lesson_state.select_lesson("L01")
+            started = time.perf_counter()
+            for _ in range(turns):
+                lesson_state.next_slide()
+                if turn_interval:
+                    time.sleep(turn_interval)
+            elapsed = time.perf_counter() - started
+            manager.close()
+            return manager.write_count, elapsed
+        finally:
+            atexit.unregister(manager.close)
+
+
+def time_flush(flushes: int):
+    """Average seconds per atomic flush and per plain in-place write of the same payload."""
+    with tempfile.TemporaryDirectory() as folder:
+        manager = UserDataManager(os.path.join(folder, "user_data.json"), write_delay=0)
+        atexit.unregister(manager.close)
+        positions = {f"L{lesson:02d}": lesson for lesson in range(50)}
+        manager.set_progress("lesson_slide_positions", positions)
+
+        started = time.perf_counter()
+        for i in range(flushes):
+            manager.set_progress("lesson_slide_positions", dict(positions, L00=i))
+        atomic = (time.perf_counter() - started) / flushes
+
+        started = time.perf_counter()
+        for _ in range(flushes):
+            with open(manager.file_path, "w", encoding="utf-8") as f:
+                json.dump(manager.data, f, ensure_ascii=False, indent=2)
+        plain = (time.perf_counter() - started) / flushes
+        return atomic, plain
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--turn-interval", type=float, default=0.05, help="seconds between slide turns")
+    parser.add_argument("--write-delay", type=float, default=0.5, help="write-behind window in seconds")
+    parser.add_argument("--flushes", type=int, default=50, help="flushes to time")
+    args = parser.parse_args()
+
+    modes = [
+        ("legacy", UnbatchedUserDataManager, 0),
+        ("batched", UserDataManager, 0),
+        ("write-behind", UserDataManager, args.write_delay),
+    ]
+    print(f"{args.turns} slide turns, {args.turn_interval * 1000:.0f} ms apart")
+    for label, manager_class, write_delay in modes:
+        writes, elapsed = run(manager_class, args.turns, write_delay, args.turn_interval)
+        busy = elapsed - args.turns * args.turn_interval
+        print(f"{label:<13} writes {writes:4d}   per turn {writes / args.turns:5.2f}   "
+              f"time in next_slide {busy / args.turns * 1000:6.3f} ms/turn")
+
+    atomic, plain = time_flush(args.flushes)
+    print(f"\nflush         atomic {atomic * 1000:6.3f} ms   plain write {plain * 1000:6.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
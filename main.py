@@ -12,6 +12,8 @@ from src.managers.user_data_manager import user_data_manager
 
 from src.managers.settings_manager import SettingsManager
 from src.utils.network_utils import should_enable_offline_mode
+from src.utils.llm_logging import configure_logging
+from src.utils.llm_metrics import llm_metrics
 
 def create_loading_screen():
     return ft.Container(
@@ -56,7 +58,10 @@ async def main(page: ft.Page):
     }
     
     # --- Initialization ---
-    llm_client = LLMClient()
+    configure_logging()
+    if config.LLM_METRICS_EXPORT_PATH:
+        llm_metrics.start_periodic_export(config.LLM_METRICS_EXPORT_PATH, config.LLM_METRICS_EXPORT_INTERVAL)
+    llm_client = LLMClient(session_id=page.session_id)
     settings_manager = SettingsManager(llm_client, page)
     
     data_manager = None
@@ -84,6 +89,9 @@ async def main(page: ft.Page):
 
     # --- Routing ---
     def route_change(route):
+        for view in page.views:
+            if isinstance(view, LessonView):
+                view.dispose()
         page.views.clear()
 
         if page.route == "/language_selection":
@@ -10,8 +10,102 @@ load_dotenv()
 DEEPSEEK_BASE_URL = "https://api.deepseek.com"
 OPENAI_BASE_URL="https://api.openai.com"
 
-BASE_URL = DEEPSEEK_BASE_URL
-MODEL = "deepseek-chat"
+# Both can be pointed elsewhere (e.g. benchmarks/mock_llm_server.py) through the environment
+BASE_URL = os.getenv("LLM_BASE_URL", DEEPSEEK_BASE_URL)
+MODEL = os.getenv("LLM_MODEL", "deepseek-chat")
+
+# Hugging Face space (or URL of a Gradio app) used as the fallback backend
+GRADIO_SPACE = os.getenv("LLM_GRADIO_SPACE", "huggingface-projects/llama-3.2-3B-Instruct")
+
+# Optional local model server speaking the OpenAI API (llama.cpp server, Ollama, ...),
+# e.g. LOCAL_LLM_BASE_URL=http://localhost:11434/v1 LOCAL_LLM_MODEL=llama3.2
+LOCAL_LLM_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL")
+LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "llama3.2")
+LOCAL_LLM_API_KEY = os.getenv("LOCAL_LLM_API_KEY", "local")  # most local servers ignore it
+LOCAL_LLM_PREFERRED = True  # try the local model before DeepSeek
+LOCAL_LLM_CALL_PROFILES = {}  # per-call-type overrides for the local model, like LLM_CALL_PROFILES
+
+# Shared HTTP connection pool used by every LLMClient in the process
+LLM_MAX_CONNECTIONS = 20
+LLM_MAX_KEEPALIVE_CONNECTIONS = 10
+LLM_KEEPALIVE_EXPIRY = 120.0  # seconds an idle connection is kept open
+LLM_REQUEST_TIMEOUT = 60.0
+LLM_CONNECT_TIMEOUT = 10.0
+
+# Backend routing: rolling window of calls per backend, circuit breaker and latency preference
+ROUTER_WINDOW = 50
+ROUTER_MIN_SAMPLES = 5  # calls per backend before latency can change the preference order
+ROUTER_PREFERENCE_BIAS = 2.0  # a less preferred backend must be this many times faster to go first
+CIRCUIT_FAILURE_THRESHOLD = 3  # consecutive failures that open a backend's circuit
+CIRCUIT_OPEN_SECONDS = 30.0  # time before an open circuit lets a probe request through
+
+# Retries of transient LLM errors (exponential backoff with full jitter; Retry-After wins when sent)
+LLM_RETRY_MAX_ATTEMPTS = 3  # attempts per backend, including the first
+LLM_RETRY_BASE_DELAY = 0.5  # seconds
+LLM_RETRY_MAX_DELAY = 8.0
+LLM_RETRY_MAX_RETRY_AFTER = 30.0  # longest server-requested wait we honour
+
+# Hedged requests: when the preferred backend hasn't answered within its p95 latency, the same
+# request is sent to the next backend and the first answer wins
+LLM_HEDGING_ENABLED = False
+LLM_HEDGE_DEFAULT_DELAY = 3.0  # seconds, until the backend has enough latency samples
+LLM_HEDGE_MIN_DELAY = 0.5
+
+# Process-wide LLM rate limits shared by all sessions (None disables a limit). Waiting requests
+# are admitted round-robin per session.
+LLM_RATE_LIMIT_RPS = 5.0  # requests per second
+LLM_RATE_LIMIT_BURST = 10  # requests that may go out back to back
+LLM_RATE_LIMIT_TPM = None  # estimated prompt + completion tokens per minute
+LLM_MAX_CONCURRENT_REQUESTS = 8
+
+# Conversation context sent with scenario calls: recent messages verbatim, older ones summarized
+CONTEXT_RECENT_MESSAGES = 6
+CONTEXT_SUMMARY_MAX_TOKENS = 150
+CONTEXT_TOKEN_BUDGETS = {  # estimated tokens of history per call type
+    "goal_evaluation": 600,
+    "turn_evaluation": 600,
+    "scenario_response": 1200,
+    "default": 800,
+}
+
+# How long (seconds) an API key validation result is trusted before re-checking
+API_KEY_VALIDATION_TTL = 6 * 3600
+# When a validation is inconclusive (timeout, 429, 5xx) the key stays in use and is re-checked
+# after this delay (seconds), doubling up to the maximum
+API_KEY_REVALIDATE_DELAY = 30.0
+API_KEY_REVALIDATE_MAX_DELAY = 600.0
+
+# Per-call deadlines (seconds) for the LLM calls of a scenario turn and of llm_check grading
+LLM_CALL_TIMEOUTS = {
+    "turn_evaluation": 20.0,
+    "goal_evaluation": 20.0,
+    "extract_information": 15.0,
+    "correction": 20.0,
+}
+
+# LLM logging: level of the "elearn.llm" logger, fraction of calls whose request/response is
+# logged at DEBUG, and whether those records contain full prompts (otherwise only hashes and sizes)
+LLM_LOG_LEVEL = os.getenv("LLM_LOG_LEVEL", "INFO")
+LLM_LOG_SAMPLE_RATE = float(os.getenv("LLM_LOG_SAMPLE_RATE", "1.0"))
+LLM_LOG_PROMPTS = os.getenv("LLM_LOG_PROMPTS", "").lower() in ("1", "true", "yes")
+
+# Periodic export of LLM call metrics: a .prom/.txt path gets Prometheus text, anything else JSONL lines
+LLM_METRICS_EXPORT_PATH = os.getenv("LLM_METRICS_EXPORT_PATH")
+LLM_METRICS_EXPORT_INTERVAL = 60.0  # seconds
+
+# Per-call-type overrides of LLMClient.CALL_PROFILES (max_tokens, temperature, stop, json_mode),
+# e.g. {"goal_evaluation": {"max_tokens": 10}}
+LLM_CALL_PROFILES = {}
+
+# Local grading of llm_check answers against the slide's "expected_answers" (similarity 0..1)
+LOCAL_GRADER_ACCEPT_SIMILARITY = 0.85  # at or above: correct without asking the LLM
+LOCAL_GRADER_REJECT_SIMILARITY = 0.35  # at or below: incorrect without asking the LLM
+
+# Cache for deterministic LLM calls (corrections, information extraction)
+RESPONSE_CACHE_MAX_ENTRIES = 256
+RESPONSE_CACHE_DB_PATH = "llm_cache.sqlite3"  # set to None to keep the cache in memory only
+RESPONSE_CACHE_TTL = 7 * 24 * 3600  # seconds
+RESPONSE_CACHE_MAX_DB_ENTRIES = 5000
 
 # --- Unified Language Configuration ---
 # This single setting controls both UI language and lesson language
@@ -28,8 +122,16 @@ def get_default_language():
     return _default_language
 
 def set_default_language(language):
-    global _default_language
+    global _default_language, _language_version
     _default_language = language
+    _language_version += 1
+
+# Bumped whenever the language selection or strings change, so derived caches (compiled prompts) rebuild
+_language_version = 0
+
+def get_language_version():
+    """Returns a counter that changes every time the language configuration changes"""
+    return _language_version
 
 LANGUAGE_DIR = "app_languages"
 
@@ -65,7 +167,8 @@ def get_target_language_folder():
 
 def load_language():
     """Load language strings from JSON file based on current configuration"""
-    global _language_strings
+    global _language_strings, _language_version
+    _language_version += 1
     ui_language = get_ui_language()
     
     try:
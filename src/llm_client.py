@@ -1,99 +1,380 @@
 # llm_client.py
 import src.config as config
-from typing import List, Dict
+from dataclasses import dataclass
+from typing import Any, List, Dict, Optional, Tuple
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import importlib.util
 import json
+import re
+import threading
+import time
+import httpx
 import openai
+from src.prompt_compiler import prompt_compiler
+from src.services.answer_grader import answer_grader
+from src.services.backend_router import BackendRouter
+from src.services.concept_index import get_concept_index
+from src.services.info_extractors import run_extractors
+from src.services.rate_limiter import llm_rate_limiter
+from src.services.retry_policy import RetryPolicy
+from src.state.conversation_context import estimate_message_tokens
+from src.utils.async_runner import llm_runner
+from src.utils.llm_logging import log_request, log_response, logger
+from src.utils.llm_metrics import llm_metrics
+from src.utils.response_cache import ResponseCache
+from src.utils.single_flight import SingleFlight
 
-# Safely import Gradio client to avoid crashing if the package isn't available
-try:
-    from gradio_client import Client
-    print("Successfully imported gradio_client")
-except Exception as e:
-    print(f"Failed to import gradio_client: {e}")
-    Client = None
+# The Gradio fallback is created lazily: importing gradio_client and constructing the Client
+# does network discovery and starts threads, which is wasted work while DeepSeek is in use.
+# Only check that the package exists here.
+GRADIO_AVAILABLE = importlib.util.find_spec("gradio_client") is not None
+_gradio_client = None
+_gradio_client_lock = threading.Lock()
+
+def _get_gradio_client():
+    """Returns the shared Gradio client, importing and connecting on first use. Blocking."""
+    global _gradio_client
+    if _gradio_client is None and GRADIO_AVAILABLE:
+        with _gradio_client_lock:
+            if _gradio_client is None:
+                try:
+                    # Safely import Gradio client to avoid crashing if the package is broken
+                    from gradio_client import Client
+                    _gradio_client = Client(config.GRADIO_SPACE)
+                    logger.info("Gradio client initialized")
+                except Exception as e:
+                    logger.warning("Could not initialize Gradio client: %s", e)
+    return _gradio_client
+
+# Strict shape of a combined turn evaluation: exactly the verdict line and the extraction line
+_TURN_RESPONSE_PATTERN = re.compile(r"^GOAL_ACHIEVED: (true|false)\nEXTRACTED: (\{.*\})$", re.DOTALL)
+
+@dataclass
+class TurnEvaluation:
+    """Result of a single-round-trip scenario turn: goal verdict plus extracted fields"""
+    goal_achieved: bool
+    extracted_info: Dict[str, Any]
+
+@dataclass(frozen=True)
+class CallProfile:
+    """Generation settings for one call type"""
+    max_tokens: int
+    temperature: float
+    stop: Optional[Tuple[str, ...]] = None
+    json_mode: bool = False  # ask for a JSON object (response_format) where the backend supports it
+    name: str = "custom"  # call type, used as the method label in metrics
+
+# Classifier-style calls only need a handful of tokens; entries can be overridden via config.LLM_CALL_PROFILES
+CALL_PROFILES = {
+    "scenario_response": CallProfile(max_tokens=150, temperature=0.7),
+    "goal_evaluation": CallProfile(max_tokens=10, temperature=0.1, stop=("\n",)),
+    "turn_evaluation": CallProfile(max_tokens=120, temperature=0.1),
+    "extraction": CallProfile(max_tokens=100, temperature=0.1, json_mode=True),
+    "correction": CallProfile(max_tokens=100, temperature=0.7),
+    "api_key_validation": CallProfile(max_tokens=1, temperature=0.1),
+}
+
+# Adjustments for small local models: deterministic classifier-style calls. Further per-call-type
+# overrides come from config.LOCAL_LLM_CALL_PROFILES
+LOCAL_CALL_PROFILE_OVERRIDES = {
+    "goal_evaluation": {"temperature": 0.0},
+    "turn_evaluation": {"temperature": 0.0},
+    "extraction": {"temperature": 0.0},
+    "correction": {"max_tokens": 120},
+}
+
+def _apply_profile_overrides(profile: CallProfile, overrides: Optional[dict]) -> CallProfile:
+    if not overrides:
+        return profile
+    if overrides.get("stop") is not None:
+        overrides = {**overrides, "stop": tuple(overrides["stop"])}
+    return dataclasses.replace(profile, **overrides)
+
+def get_call_profile(call_type: str) -> CallProfile:
+    """Returns the profile for call_type with any config.LLM_CALL_PROFILES overrides applied"""
+    profile = dataclasses.replace(CALL_PROFILES[call_type], name=call_type)
+    return _apply_profile_overrides(profile, config.LLM_CALL_PROFILES.get(call_type))
+
+def _backend_profile(profile: CallProfile, backend: str) -> CallProfile:
+    """The profile as sent to backend: the local model has its own adjustments"""
+    if backend != BACKEND_LOCAL:
+        return profile
+    profile = _apply_profile_overrides(profile, LOCAL_CALL_PROFILE_OVERRIDES.get(profile.name))
+    return _apply_profile_overrides(profile, config.LOCAL_LLM_CALL_PROFILES.get(profile.name))
+
+def _truncate_at_stop(text: str, stop: Optional[Tuple[str, ...]]) -> str:
+    """Applies stop sequences locally for backends that don't support them"""
+    for sequence in stop or ():
+        index = text.find(sequence)
+        if index != -1:
+            text = text[:index]
+    return text
+
+BACKEND_OPENAI = "openai"
+BACKEND_GRADIO = "gradio"
+BACKEND_LOCAL = "local"  # OpenAI-compatible server on the machine or LAN (llama.cpp server, Ollama, ...)
+
+# Health of each backend is tracked process-wide, so every session benefits from what the others observed
+backend_router = BackendRouter(
+    window=config.ROUTER_WINDOW,
+    failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+    open_seconds=config.CIRCUIT_OPEN_SECONDS,
+    min_samples=config.ROUTER_MIN_SAMPLES,
+    preference_bias=config.ROUTER_PREFERENCE_BIAS
+)
+
+# Transient errors are retried here rather than inside the OpenAI SDK (max_retries=0), so the
+# backoff honours Retry-After and every attempt shows up in the metrics
+retry_policy = RetryPolicy(
+    max_attempts=config.LLM_RETRY_MAX_ATTEMPTS,
+    base_delay=config.LLM_RETRY_BASE_DELAY,
+    max_delay=config.LLM_RETRY_MAX_DELAY,
+    max_retry_after=config.LLM_RETRY_MAX_RETRY_AFTER
+)
+
+# Process-wide cache for deterministic calls, shared by every session
+response_cache = ResponseCache(
+    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+    db_path=config.RESPONSE_CACHE_DB_PATH,
+    ttl=config.RESPONSE_CACHE_TTL,
+    max_db_entries=config.RESPONSE_CACHE_MAX_DB_ENTRIES
+)
+
+# Identical completions already in flight are shared instead of sent twice (double-clicks,
+# Enter + Send firing together, several sessions asking the same thing). Lives on the llm_runner loop.
+single_flight = SingleFlight()
+
+# Keep-alive connection pool shared by every LLMClient in the process (one per web session).
+# AsyncOpenAI clients are cached per (api_key, base_url) and all reuse this pool; they are
+# only ever awaited on the shared llm_runner loop, which owns the pooled connections.
+_http_client = None
+_openai_clients = {}
+_openai_clients_lock = threading.Lock()
+
+def _get_openai_client(api_key: str, base_url: str = None) -> openai.AsyncOpenAI:
+    """Returns the shared AsyncOpenAI client for this key and endpoint, creating the pool on first use"""
+    global _http_client
+    with _openai_clients_lock:
+        if _http_client is None:
+            _http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=config.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(config.LLM_REQUEST_TIMEOUT, connect=config.LLM_CONNECT_TIMEOUT)
+            )
+        base_url = base_url or config.BASE_URL
+        key = (api_key, base_url)
+        client = _openai_clients.get(key)
+        if client is None:
+            client = openai.AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=_http_client,
+                max_retries=0
+            )
+            _openai_clients[key] = client
+        return client
+
+# API key validation results per key fingerprint: {fingerprint: (is_valid, checked_at)}
+_validation_cache = {}
+_validation_cache_lock = threading.Lock()
+
+def _key_fingerprint(api_key: str) -> str:
+    """Identifies an API key (and the endpoint it was checked against) without storing it"""
+    return hashlib.sha256(f"{config.BASE_URL}|{api_key}".encode("utf-8")).hexdigest()[:16]
+
+def _get_cached_validation(api_key: str) -> Optional[bool]:
+    """Returns the cached validation result for this key, or None if unknown or expired"""
+    with _validation_cache_lock:
+        entry = _validation_cache.get(_key_fingerprint(api_key))
+    if entry is None:
+        return None
+    is_valid, checked_at = entry
+    if time.time() - checked_at > config.API_KEY_VALIDATION_TTL:
+        return None
+    return is_valid
+
+def _cache_validation(api_key: str, is_valid: bool):
+    with _validation_cache_lock:
+        _validation_cache[_key_fingerprint(api_key)] = (is_valid, time.time())
+
+def _on_llm_loop(coro_fn):
+    """Makes an async LLMClient method always execute on the shared llm_runner loop"""
+    @functools.wraps(coro_fn)
+    async def wrapper(*args, **kwargs):
+        return await llm_runner.run_async(coro_fn(*args, **kwargs))
+    return wrapper
 
 class LLMClient:
-    def __init__(self):
+    """
+    LLM access for the app. The `*_async` methods are the native implementation and run on the
+    shared llm_runner loop; the sync methods of the same name are thin blocking wrappers over them.
+    """
+    def __init__(self, session_id: Optional[str] = None):
+        self.session_id = session_id  # the web session this client serves, for fair rate limiting
         self.openai_client = None
-        self.gradio_client = None
+        self.local_client = None
         self.api_key_valid = False
         self.using_deepseek = False
         self.active = False
+        self.validation_pending = False
+        self._validation_generation = 0
         self._initialize_clients()
     
     def _initialize_clients(self):
-        """Initialize both OpenAI and Gradio clients"""
-        # Initialize Gradio client (always available as fallback)
-        try:
-            if Client is not None:
-                self.gradio_client = Client("huggingface-projects/llama-3.2-3B-Instruct")
-        except Exception as e:
-            print(f"Warning: Could not initialize Gradio client: {e}")
-        
+        """Initialize the OpenAI and local clients; the Gradio fallback is created on first use"""
         # Try to initialize OpenAI client if API key is available
         self.update_api_key()
+
+    def warm_gradio_client(self):
+        """Connects the Gradio fallback in the background so the first fallback call doesn't pay for it"""
+        if GRADIO_AVAILABLE and _gradio_client is None:
+            llm_runner.submit(asyncio.to_thread(_get_gradio_client))
     
-    def validate_api_key(self, api_key: str = None) -> bool:
-        """Validate if the API key works by making a test request"""
+    def validate_api_key(self, api_key: str = None) -> Optional[bool]:
+        """
+        Validate if the API key works by making a test request. Returns True if it works, False if
+        the API rejected it and None if that couldn't be determined (timeout, rate limit, server error).
+        """
+        return llm_runner.run(self.validate_api_key_async(api_key))
+
+    @_on_llm_loop
+    async def validate_api_key_async(self, api_key: str = None) -> Optional[bool]:
+        """Async version of validate_api_key. Results are cached per key fingerprint for API_KEY_VALIDATION_TTL."""
         if not api_key:
             api_key = config.get_effective_api_key()
         
         if not api_key:
             return False
+
+        cached = _get_cached_validation(api_key)
+        if cached is not None:
+            return cached
         
+        profile = get_call_profile("api_key_validation")
+        started = time.monotonic()
         try:
-            test_client = openai.OpenAI(
-                api_key=api_key,
-                base_url=config.BASE_URL
-            )
+            test_client = _get_openai_client(api_key)
             
             # Make a minimal test request
-            response = test_client.chat.completions.create(
+            response = await test_client.chat.completions.create(
                 model=config.MODEL,
                 messages=[{"role": "user", "content": "Hi"}],
-                max_tokens=5,
-                temperature=0.1
+                **self._openai_request_options(profile)
             )
+            llm_metrics.record_success(profile.name, BACKEND_OPENAI, time.monotonic() - started)
+            llm_metrics.record_usage(profile.name, BACKEND_OPENAI, response.usage)
             
+            _cache_validation(api_key, True)
             return True
-        except Exception as e:
-            print(f"API key validation failed: {e}")
+        except (openai.AuthenticationError, openai.PermissionDeniedError) as e:
+            # Only a definitive rejection is cached; transient errors are retried next time
+            llm_metrics.record_error(profile.name, BACKEND_OPENAI, time.monotonic() - started, e)
+            logger.warning("API key validation failed: %s", e)
+            _cache_validation(api_key, False)
             return False
+        except Exception as e:
+            llm_metrics.record_error(profile.name, BACKEND_OPENAI, time.monotonic() - started, e)
+            logger.warning("API key validation inconclusive: %s", e)
+            return None
     
-    def update_api_key(self):
-        """Update API key and determine which client to use"""
+    def update_api_key(self, inconclusive: bool = False):
+        """
+        Update API key and determine which client to use. Never blocks on the network: a key
+        without a cached validation result is used provisionally while it is validated in the background.
+        Pass inconclusive=True when the caller has just validated the key without a clear answer;
+        the background recheck then waits API_KEY_REVALIDATE_DELAY instead of asking again right away.
+        """
+        self._configure_local_backend()
         api_key = config.get_effective_api_key()
-        
-        if api_key and self.validate_api_key(api_key):
+        self._validation_generation += 1
+        generation = self._validation_generation
+
+        if not api_key:
+            self.validation_pending = False
+            self._apply_validation(api_key, False)
+            return
+
+        cached = _get_cached_validation(api_key)
+        if cached is not None:
+            self.validation_pending = False
+            self._apply_validation(api_key, cached)
+            return
+
+        # Provisionally active on DeepSeek until the background validation answers
+        self.openai_client = _get_openai_client(api_key)
+        self.api_key_valid = False
+        self.using_deepseek = True
+        self.active = True
+        self.validation_pending = True
+        llm_runner.submit(self._validate_in_background(api_key, generation, inconclusive))
+
+    def _configure_local_backend(self):
+        """Points the local backend at LOCAL_LLM_BASE_URL, or disables it when that isn't set"""
+        if config.LOCAL_LLM_BASE_URL:
+            self.local_client = _get_openai_client(config.LOCAL_LLM_API_KEY, config.LOCAL_LLM_BASE_URL)
+        else:
+            self.local_client = None
+
+    async def _validate_in_background(self, api_key: str, generation: int, inconclusive: bool = False):
+        delay = config.API_KEY_REVALIDATE_DELAY
+        while True:
+            if inconclusive:
+                # Keep using the key provisionally (the router and retries handle failures
+                # meanwhile) and ask again later
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, config.API_KEY_REVALIDATE_MAX_DELAY)
+                if generation != self._validation_generation:
+                    return
+            is_valid = await self.validate_api_key_async(api_key)
+            # Ignore results for a key that was replaced while validating
+            if generation != self._validation_generation:
+                return
+            if is_valid is not None:
+                self.validation_pending = False
+                self._apply_validation(api_key, is_valid)
+                return
+            inconclusive = True
+
+    def _apply_validation(self, api_key: str, is_valid: Optional[bool]):
+        """Selects the backend according to the validation result for api_key (None: not known yet)"""
+        if api_key and is_valid is None:
+            # Only a rejection demotes the key; until then it stays the provisional DeepSeek backend
+            self.openai_client = _get_openai_client(api_key)
+            self.api_key_valid = False
+            self.using_deepseek = True
+            self.active = True
+            return
+
+        if api_key and is_valid:
             try:
-                self.openai_client = openai.OpenAI(
-                    api_key=api_key,
-                    base_url=config.BASE_URL
-                )
+                self.openai_client = _get_openai_client(api_key)
                 self.api_key_valid = True
                 self.using_deepseek = True
                 self.active = True
-                print("Using DeepSeek API")
+                logger.info("Using DeepSeek API%s", " (and the local model)" if self.local_client else "")
+                return
             except Exception as e:
-                print(f"Failed to initialize OpenAI client: {e}")
-                self.api_key_valid = False
-                self.using_deepseek = False
-                # Fall back to Gradio if available
-                if self.gradio_client is not None:
-                    self.active = True
-                    print("Falling back to Gradio client")
-                else:
-                    self.active = False
+                logger.error("Failed to initialize OpenAI client: %s", e)
+
+        self.api_key_valid = False
+        self.using_deepseek = False
+        if self.local_client is not None:
+            self.active = True
+            logger.info("Using local model %s at %s", config.LOCAL_LLM_MODEL, config.LOCAL_LLM_BASE_URL)
+        # Use Gradio as fallback; the key is missing or rejected, so connect it in the background now
+        elif GRADIO_AVAILABLE:
+            self.active = True
+            logger.info("Using Gradio client (fallback)")
+            self.warm_gradio_client()
         else:
-            self.api_key_valid = False
-            self.using_deepseek = False
-            # Use Gradio as fallback
-            if self.gradio_client is not None:
-                self.active = True
-                print("Using Gradio client (fallback)")
-            else:
-                self.active = False
-                print("No LLM client available")
+            self.active = False
+            logger.warning("No LLM client available")
     
     def get_api_status(self) -> dict:
         """Get current API status for UI display"""
@@ -101,13 +382,55 @@ class LLMClient:
             "has_api_key": config.get_effective_api_key() is not None,
             "api_key_valid": self.api_key_valid,
             "using_deepseek": self.using_deepseek,
-            "using_gradio": not self.using_deepseek and self.active
+            "using_local": self.local_client is not None,
+            "using_gradio": not self.using_deepseek and self.local_client is None and self.active,
+            "validation_pending": self.validation_pending,
+            "response_cache": response_cache.stats(),
+            "single_flight": single_flight.stats(),
+            "rate_limiter": llm_rate_limiter.stats(),
+            "llm_metrics": llm_metrics.snapshot(),
+            "answer_grader": answer_grader.stats(),
+            "backend_order": backend_router.route(self._candidate_backends()),
+            "backends": backend_router.snapshot()
         }
     
+    def get_queue_status(self) -> dict:
+        """How many LLM requests are waiting for the rate limiter, and how long this session has waited"""
+        return llm_rate_limiter.queue_status(self.session_id)
+
     def is_deepseek_active(self) -> bool:
         """Check if DeepSeek API is currently active"""
         return self.using_deepseek and self.api_key_valid
     
+    def is_local_active(self) -> bool:
+        """Check if a local model server is configured"""
+        return self.local_client is not None
+
+    def _log_api_error(self, error: Exception):
+        backends = ", ".join(self._candidate_backends()) or "no backend"
+        logger.error("Error in LLM API call (%s): %s", backends, error)
+
+    def _backend_model(self, backend: str) -> str:
+        """Identifies the model behind a backend (part of cache keys)"""
+        if backend == BACKEND_LOCAL:
+            return config.LOCAL_LLM_MODEL
+        if backend == BACKEND_OPENAI:
+            return config.MODEL
+        return config.GRADIO_SPACE
+
+    def _model_name(self) -> str:
+        """Identifies the model expected to answer: the first backend the router would try"""
+        backends = backend_router.route(self._candidate_backends())
+        return self._backend_model(backends[0]) if backends else config.GRADIO_SPACE
+
+    def _cache_key(self, method: str, system_prompt: str, user_input: str, backend: Optional[str] = None) -> str:
+        """
+        Response cache key under the model of the backend that answered, or of the one expected
+        to answer when looking up. A fallback answer never lands under the preferred model's key.
+        """
+        model = self._backend_model(backend) if backend else self._model_name()
+        return ResponseCache.make_key(method, model, system_prompt, user_input)
+
     def _format_messages_for_gradio(self, messages: List[Dict[str, str]]) -> str:
         """Convert OpenAI-style messages to a single prompt string for Gradio"""
         formatted_prompt = ""
@@ -130,7 +453,10 @@ class LLMClient:
     def _call_gradio_client(self, prompt: str, max_tokens: int = 150, temperature: float = 0.7) -> str:
         """Make a call to the Gradio client with the given prompt"""
         try:
-            result = self.gradio_client.predict(
+            gradio_client = _get_gradio_client()
+            if gradio_client is None:
+                raise RuntimeError("Gradio client is not available")
+            result = gradio_client.predict(
                 message=prompt,
                 max_new_tokens=max_tokens,
                 temperature=temperature,
@@ -144,91 +470,414 @@ class LLMClient:
             # Let the calling method handle error logging to avoid duplicates
             raise e
 
-    def get_scenario_response(self, history: List[Dict[str, str]], concepts_to_check: Dict[str, str]):
+    def _candidate_backends(self) -> List[str]:
+        """Backends this client may use, in preference order"""
+        candidates = []
+        if self.using_deepseek and self.openai_client:
+            candidates.append(BACKEND_OPENAI)
+        if self.local_client is not None:
+            # No WAN round trip and no per-token cost: ahead of DeepSeek unless configured otherwise
+            candidates.insert(0 if config.LOCAL_LLM_PREFERRED else len(candidates), BACKEND_LOCAL)
+        if GRADIO_AVAILABLE:
+            candidates.append(BACKEND_GRADIO)
+        return candidates
+
+    async def _complete(self, messages: List[Dict[str, str]], profile: CallProfile) -> str:
         """
-        Gets a response from the LLM for a scenario, asking it to evaluate concepts.
+        Run one chat completion, joining an identical request that is already in flight.
+        Must be awaited on the llm_runner loop.
         """
-        if not self.active:
-            return f"CONCEPTS_COVERED: []\n{config.get_text('llm_not_configured_scenario', 'LLM client not configured.')}"
+        response_text, _ = await self._complete_answered(messages, profile)
+        return response_text
+
+    async def _complete_answered(self, messages: List[Dict[str, str]], profile: CallProfile) -> Tuple[str, str]:
+        """Like _complete, but also returns the backend that produced the answer: (text, backend)"""
+        key = SingleFlight.make_key(self._model_name(), messages, dataclasses.asdict(profile))
+        return await single_flight.run(key, lambda: self._complete_routed(messages, profile))
+
+    async def _complete_routed(self, messages: List[Dict[str, str]], profile: CallProfile) -> Tuple[str, str]:
+        """Run one chat completion, failing over between backends in the order chosen by the router"""
+        backends = backend_router.route(self._candidate_backends())
+        if config.LLM_HEDGING_ENABLED and len(backends) > 1:
+            return await self._complete_hedged(backends, messages, profile)
+
+        last_error = None
+        for backend in backends:
+            try:
+                return await self._complete_with_retries(backend, messages, profile), backend
+            except Exception as e:
+                last_error = e
+        raise last_error or RuntimeError("No LLM backend available")
+
+    async def _complete_hedged(self, backends: List[str], messages: List[Dict[str, str]], profile: CallProfile) -> Tuple[str, str]:
+        """
+        Sends the request to the first backend and, if it hasn't answered within its p95 latency,
+        the same request to the second one. The first success wins and the other call is cancelled.
+        """
+        primary, secondary = backends[0], backends[1]
+        hedge_delay = backend_router.latency_percentile(primary, 95) or config.LLM_HEDGE_DEFAULT_DELAY
+        hedge_delay = max(hedge_delay, config.LLM_HEDGE_MIN_DELAY)
 
-        # Get the target language from configuration
-        language_info = config.get_language_info()
-        target_language = language_info["target_language_folder"].title()
+        primary_task = asyncio.ensure_future(self._complete_with_retries(primary, messages, profile))
+        task_backends = {primary_task: primary}
+        pending = {primary_task}
+        hedged = False
+        last_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=None if hedged else hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), task_backends[task]
+                    last_error = task.exception()
+                if not hedged:
+                    # The primary is slow (or already failed): race the secondary against it
+                    hedged = True
+                    if not done:
+                        logger.info("Hedging %s request to '%s' after %.2fs", profile.name, secondary, hedge_delay)
+                    secondary_task = asyncio.ensure_future(self._complete_with_retries(secondary, messages, profile))
+                    task_backends[secondary_task] = secondary
+                    pending.add(secondary_task)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        for backend in backends[2:]:
+            try:
+                return await self._complete_with_retries(backend, messages, profile), backend
+            except Exception as e:
+                last_error = e
+        raise last_error or RuntimeError("No LLM backend available")
 
-        # Convert the concepts dict to a string for the chatbot_message
-        concepts_json_str = json.dumps(concepts_to_check, ensure_ascii=False)
+    async def _complete_with_retries(self, backend: str, messages: List[Dict[str, str]], profile: CallProfile) -> str:
+        """Runs the completion on one backend, retrying transient errors, and records the outcome"""
+        if not backend_router.acquire(backend):
+            raise RuntimeError(f"LLM backend '{backend}' is unavailable")
+
+        # Latency is measured per attempt, from admission by the rate limiter to the answer,
+        # so neither queueing nor retry backoff ends up in the histograms
+        attempt_started = time.monotonic()
+
+        async def attempt() -> str:
+            nonlocal attempt_started
+            async with self._rate_limit_slot(messages, profile):
+                attempt_started = time.monotonic()
+                return await self._complete_on(backend, messages, profile)
+
+        def on_retry(attempt_number: int, error: Exception, delay: float):
+            llm_metrics.record_error(profile.name, backend, time.monotonic() - attempt_started, error)
+            llm_metrics.record_retry(profile.name, backend)
+            logger.info("Retrying %s on '%s' in %.2fs (attempt %d failed: %s)", profile.name, backend, delay, attempt_number, error)
+
+        try:
+            response_text = await retry_policy.run(attempt, on_retry)
+        except Exception as e:
+            backend_router.record_failure(backend, time.monotonic() - attempt_started, e)
+            llm_metrics.record_error(profile.name, backend, time.monotonic() - attempt_started, e)
+            logger.warning("LLM backend '%s' failed: %s", backend, e)
+            raise
+        except BaseException:
+            backend_router.release(backend)
+            raise
+        backend_router.record_success(backend, time.monotonic() - attempt_started)
+        llm_metrics.record_success(profile.name, backend, time.monotonic() - attempt_started)
+        return response_text
 
-        system_prompt = config.get_text(
-            "scenario_system_prompt",
-            "You are a language assistant. Your main goal is to have a natural conversation in {target_language} with the user to help them practice.\n\nCRITICAL CONSTRAINT: In your conversational responses, you can ONLY use words and phrases from the following lesson concepts: {concepts}. Do not use any {target_language} words that are not on this list. If you need to communicate something that is not in the concepts, use Spanish or English.\n\nYou have a VERY IMPORTANT AND HIDDEN SECONDARY TASK.\nBefore writing your conversational response, you MUST analyze the user's last message to see if they have used any of the following concepts: {concepts}.\nDon't be too strict; if the user uses a close form or a key part of the phrase, count it as valid.\n\nYour response MUST follow this EXACT format:\n1. A line starting with `CONCEPTS_COVERED: ` followed by a JSON list of the `item_id`s of the concepts the user JUST used. If they used none, the list should be empty `[]`.\n2. A newline character `\n`.\n3. Your normal conversational response in {target_language} (ONLY using concepts from the list).\n\nExample 1 (user uses concepts):\nCONCEPTS_COVERED: [\"L01_V01\", \"L01_G01\"]\nJa, natuurlijk. Een momentje.\n\nExample 2 (user does not use concepts):\nCONCEPTS_COVERED: []\nHallo! Wat kan ik voor je doen?\n\nNEVER mention the concepts or this secondary task to the user. Just act your role and provide the control line at the beginning."
-        ).format(target_language=target_language, concepts=concepts_json_str)
+    def _openai_request_options(self, profile: CallProfile) -> dict:
+        options = {"max_tokens": profile.max_tokens, "temperature": profile.temperature}
+        if profile.stop:
+            options["stop"] = list(profile.stop)
+        if profile.json_mode:
+            options["response_format"] = {"type": "json_object"}
+        return options
+
+    def _openai_compatible_backend(self, backend: str):
+        """(client, model) for the backends that speak the OpenAI API"""
+        if backend == BACKEND_LOCAL:
+            return self.local_client, config.LOCAL_LLM_MODEL
+        return self.openai_client, config.MODEL
+
+    def _rate_limit_slot(self, messages: List[Dict[str, str]], profile: CallProfile):
+        """Admission slot for one request; every attempt, retry and hedge counts against the limits"""
+        tokens = sum(estimate_message_tokens(message) for message in messages) + profile.max_tokens
+        return llm_rate_limiter.slot(self.session_id, tokens)
+
+    async def _complete_on(self, backend: str, messages: List[Dict[str, str]], profile: CallProfile) -> str:
+        if backend in (BACKEND_OPENAI, BACKEND_LOCAL):
+            # DeepSeek API or the local model server
+            client, model = self._openai_compatible_backend(backend)
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                **self._openai_request_options(_backend_profile(profile, backend))
+            )
+            llm_metrics.record_usage(profile.name, backend, response.usage)
+            return response.choices[0].message.content
+
+        # Use Gradio fallback; the blocking client runs on the runner loop's shared executor
+        prompt = self._format_messages_for_gradio(messages)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None,
+            functools.partial(self._call_gradio_client, prompt, max_tokens=profile.max_tokens, temperature=profile.temperature)
+        )
+        return _truncate_at_stop(result, profile.stop)
+
+    async def _stream(self, messages: List[Dict[str, str]], profile: CallProfile):
+        """
+        Async generator of (backend, text delta) pairs, backend being the one answering. Fails over
+        to the next backend only while nothing has been yielded yet. Must be iterated on the llm_runner loop.
+        """
+        last_error = None
+        for backend in backend_router.route(self._candidate_backends()):
+            if not backend_router.acquire(backend):
+                continue
+            # Measured per attempt from admission by the rate limiter, like _complete_with_retries
+            started = time.monotonic()
+            streamed_any = False
+            attempt = 1
+            try:
+                while True:
+                    try:
+                        async with self._rate_limit_slot(messages, profile):
+                            started = time.monotonic()
+                            async for delta in self._stream_on(backend, messages, profile):
+                                if not streamed_any:
+                                    llm_metrics.record_first_token(profile.name, backend, time.monotonic() - started)
+                                streamed_any = True
+                                yield backend, delta
+                        break
+                    except Exception as e:
+                        # A stream can only be retried before anything reached the caller
+                        if streamed_any or not retry_policy.should_retry(attempt, e):
+                            raise
+                        delay = retry_policy.delay(attempt, e)
+                        llm_metrics.record_error(profile.name, backend, time.monotonic() - started, e)
+                        llm_metrics.record_retry(profile.name, backend)
+                        logger.info("Retrying %s stream on '%s' in %.2fs (attempt %d failed: %s)", profile.name, backend, delay, attempt, e)
+                        await asyncio.sleep(delay)
+                        attempt += 1
+            except Exception as e:
+                backend_router.record_failure(backend, time.monotonic() - started, e)
+                llm_metrics.record_error(profile.name, backend, time.monotonic() - started, e)
+                logger.warning("LLM backend '%s' failed: %s", backend, e)
+                if streamed_any:
+                    raise
+                last_error = e
+                continue
+            except BaseException:
+                # Closed early by the consumer or cancelled
+                if streamed_any:
+                    backend_router.record_success(backend, time.monotonic() - started)
+                    llm_metrics.record_success(profile.name, backend, time.monotonic() - started)
+                else:
+                    backend_router.release(backend)
+                raise
+            backend_router.record_success(backend, time.monotonic() - started)
+            llm_metrics.record_success(profile.name, backend, time.monotonic() - started)
+            return
+        raise last_error or RuntimeError("No LLM backend available")
+
+    async def _stream_on(self, backend: str, messages: List[Dict[str, str]], profile: CallProfile):
+        if backend in (BACKEND_OPENAI, BACKEND_LOCAL):
+            client, model = self._openai_compatible_backend(backend)
+            stream = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                **self._openai_request_options(_backend_profile(profile, backend))
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        # Sent in a final chunk without choices
+                        llm_metrics.record_usage(profile.name, backend, chunk.usage)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+            return
+
+        prompt = self._format_messages_for_gradio(messages)
+        streamed = ""
+        async for delta in self._stream_gradio_client(prompt, max_tokens=profile.max_tokens, temperature=profile.temperature):
+            truncated = _truncate_at_stop(streamed + delta, profile.stop)
+            if len(truncated) < len(streamed) + len(delta):
+                # A stop sequence arrived: emit what precedes it and end the stream
+                if len(truncated) > len(streamed):
+                    yield truncated[len(streamed):]
+                return
+            streamed = truncated
+            yield delta
+
+    async def _stream_gradio_client(self, prompt: str, max_tokens: int = 150, temperature: float = 0.7):
+        """Yields incremental output of a Gradio job. The space streams cumulative text, so only the new suffix is yielded."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        jobs = []
+
+        def pump():
+            try:
+                gradio_client = _get_gradio_client()
+                if gradio_client is None:
+                    raise RuntimeError("Gradio client is not available")
+                job = gradio_client.submit(
+                    message=prompt,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                    top_p=0.9,
+                    top_k=50,
+                    repetition_penalty=1.2,
+                    api_name="/chat"
+                )
+                jobs.append(job)
+                produced = False
+                for output in job:
+                    produced = True
+                    loop.call_soon_threadsafe(queue.put_nowait, output)
+                if not produced:
+                    # Spaces without a queue expose no intermediate outputs
+                    loop.call_soon_threadsafe(queue.put_nowait, job.result())
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        loop.run_in_executor(None, pump)
+        previous = ""
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                text = str(item)
+                delta = text[len(previous):] if text.startswith(previous) else text
+                previous = text
+                if delta:
+                    yield delta
+        finally:
+            for job in jobs:
+                if not job.done():
+                    job.cancel()
+
+    def _build_scenario_messages(self, history: List[Dict[str, str]], concepts_to_check: Dict[str, str]) -> List[Dict[str, str]]:
+        """Builds the chat messages for a scenario response"""
+        system_prompt = prompt_compiler.compile("scenario", concepts=concepts_to_check)
         
         messages = [{"role": "system", "content": system_prompt}] + history
         
-        # Print the LLM input to console for debugging
-        print("\n" + "="*50)
-        print("LLM INPUT:")
-        print("="*50)
-        print("SYSTEM PROMPT:")
-        print(system_prompt)
-        print("\nCONVERSATION HISTORY:")
-        for i, msg in enumerate(history):
-            print(f"{i+1}. {msg['role'].upper()}: {msg['content']}")
-        print("="*50 + "\n")
+        log_request("scenario_response", messages)
+
+        return messages
+
+    def _build_goal_evaluation_messages(self, history: List[Dict[str, str]], current_goal: str) -> List[Dict[str, str]]:
+        """Builds the chat messages for a goal evaluation"""
+        system_prompt = prompt_compiler.compile("goal_evaluation", goal=current_goal)
+        
+        messages = [{"role": "system", "content": system_prompt}] + history
+        
+        log_request("goal_evaluation", messages)
+
+        return messages
+
+    def get_scenario_response(self, history: List[Dict[str, str]], concepts_to_check: Dict[str, str]):
+        """
+        Gets a response for a scenario: a `CONCEPTS_COVERED: [...]` control line followed by the reply.
+        Concept usage is detected locally, so the LLM only writes the conversational reply.
+        """
+        return llm_runner.run(self.get_scenario_response_async(history, concepts_to_check))
+
+    @_on_llm_loop
+    async def get_scenario_response_async(self, history: List[Dict[str, str]], concepts_to_check: Dict[str, str]):
+        """Async version of get_scenario_response"""
+        if not self.active:
+            return f"CONCEPTS_COVERED: []\n{config.get_text('llm_not_configured_scenario', 'LLM client not configured.')}"
+
+        control_line = self._concepts_control_line(history, concepts_to_check)
+        messages = self._build_scenario_messages(history, concepts_to_check)
 
         try:
-            if self.using_deepseek and self.openai_client:
-                # Use DeepSeek API
-                response = self.openai_client.chat.completions.create(
-                    model=config.MODEL,
-                    messages=messages,
-                    max_tokens=150,
-                    temperature=0.7
-                )
-                response_text = response.choices[0].message.content
-            else:
-                # Use Gradio fallback
-                prompt = self._format_messages_for_gradio(messages)
-                response_text = self._call_gradio_client(prompt, max_tokens=150, temperature=0.7)
-            
-            # Print the LLM response to console for debugging
-            print("LLM RESPONSE:")
-            print("-" * 30)
-            print(response_text)
-            print("-" * 30 + "\n")
-            
+            reply = await self._complete(messages, get_call_profile("scenario_response"))
+            response_text = f"{control_line}\n{reply}"
+            log_response("scenario_response", response_text)
             return response_text
         except Exception as e:
-            error_type = "deepseek_api_error" if self.using_deepseek else "gradio_api_error"
-            print(config.get_text(error_type, "Error in API call: {error}").format(error=str(e)))
-            return f"CONCEPTS_COVERED: []\n{config.get_text('api_error_scenario', 'There was an error contacting the AI service.')}"
+            self._log_api_error(e)
+            return f"{control_line}\n{config.get_text('api_error_scenario', 'There was an error contacting the AI service.')}"
+
+    def stream_scenario_response(self, history: List[Dict[str, str]], concepts_to_check: Dict[str, str]):
+        """
+        Streaming version of get_scenario_response: an async iterator of text chunks, starting with
+        the CONCEPTS_COVERED control line. Chunks are delivered in the caller's event loop.
+        """
+        return llm_runner.iterate_async(self._stream_scenario_response(history, concepts_to_check))
+
+    async def _stream_scenario_response(self, history: List[Dict[str, str]], concepts_to_check: Dict[str, str]):
+        if not self.active:
+            yield f"CONCEPTS_COVERED: []\n{config.get_text('llm_not_configured_scenario', 'LLM client not configured.')}"
+            return
+
+        # The control line is known locally, so it goes out before the first token arrives
+        yield self._concepts_control_line(history, concepts_to_check) + "\n"
+        messages = self._build_scenario_messages(history, concepts_to_check)
+        streamed_any = False
+        try:
+            async for _, delta in self._stream(messages, get_call_profile("scenario_response")):
+                streamed_any = True
+                yield delta
+        except Exception as e:
+            self._log_api_error(e)
+            error_text = config.get_text('api_error_scenario', 'There was an error contacting the AI service.')
+            yield f"\n{error_text}" if streamed_any else error_text
+
+    def _concepts_control_line(self, history: List[Dict[str, str]], concepts_to_check: Dict[str, str]) -> str:
+        """Builds the CONCEPTS_COVERED line for the user's latest message with the local concept index"""
+        last_user_message = next((msg["content"] for msg in reversed(history) if msg["role"] == "user"), "")
+        covered = get_concept_index(concepts_to_check).find_covered(last_user_message) if concepts_to_check else []
+        return f"CONCEPTS_COVERED: {json.dumps(covered)}"
 
-    def extract_information(self, user_message: str, extract_info: Dict[str, str]):
+    def extract_information(self, user_message: str, extract_info: Dict[str, str], extractors: Optional[Dict[str, str]] = None):
         """
         Extract specific information from user message based on extract_info specifications.
+        Fields with a local extractor (see services/info_extractors.py) are tried locally first;
+        the LLM is only asked for the fields that are still null.
         Returns a dictionary with extracted values.
         """
-        if not self.active:
-            return {}
+        return llm_runner.run(self.extract_information_async(user_message, extract_info, extractors))
 
+    @_on_llm_loop
+    async def extract_information_async(self, user_message: str, extract_info: Dict[str, str], extractors: Optional[Dict[str, str]] = None):
+        """Async version of extract_information"""
         if not extract_info:
             return {}
 
-        # Get the target language from configuration
-        language_info = config.get_language_info()
-        target_language = language_info["target_language_code"].title()
+        local_info = run_extractors(user_message, extract_info, extractors)
+        remaining = {key: description for key, description in extract_info.items() if local_info[key] is None}
+        if not remaining:
+            return local_info
+        if not self.active:
+            return local_info if extractors else {}
+
+        llm_info = await self._extract_with_llm(user_message, remaining)
+        if not extractors:
+            return llm_info
+        if isinstance(llm_info, dict):
+            local_info.update({key: llm_info[key] for key in remaining if llm_info.get(key) is not None})
+        return local_info
 
-        # Build extraction instructions
-        extraction_instructions = []
-        for key, description in extract_info.items():
-            extraction_instructions.append(f"- {key}: {description}")
-        
-        instructions_text = "\n".join(extraction_instructions)
+    async def _extract_with_llm(self, user_message: str, extract_info: Dict[str, str]) -> Dict[str, Any]:
+        system_prompt = prompt_compiler.compile("extraction", extract_info=extract_info)
 
-        system_prompt = config.get_text(
-            "info_extraction_system_prompt",
-            "You are an information extraction assistant. The user is learning {target_language}. Extract the following information from the user's message:\n\n{instructions}\n\nRespond with ONLY a JSON object containing the extracted values. If you cannot extract a value, use null. Example: {{\"user_name\": \"John\", \"age\": null}}"
-        ).format(target_language=target_language, instructions=instructions_text)
+        cached = await response_cache.get_async(self._cache_key("extract_information", system_prompt, user_message))
+        if cached is not None:
+            return cached
 
         try:
             messages = [
@@ -236,31 +885,20 @@ class LLMClient:
                 {"role": "user", "content": user_message}
             ]
             
-            if self.using_deepseek and self.openai_client:
-                # Use DeepSeek API
-                response = self.openai_client.chat.completions.create(
-                    model=config.MODEL,
-                    messages=messages,
-                    max_tokens=100,
-                    temperature=0.1
-                )
-                response_text = response.choices[0].message.content.strip()
-            else:
-                # Use Gradio fallback
-                prompt = self._format_messages_for_gradio(messages)
-                response_text = self._call_gradio_client(prompt, max_tokens=100, temperature=0.1).strip()
+            response_text, backend = await self._complete_answered(messages, get_call_profile("extraction"))
+            response_text = response_text.strip()
             
             # Parse JSON response
             try:
                 extracted_data = json.loads(response_text)
+                response_cache.set(self._cache_key("extract_information", system_prompt, user_message, backend), extracted_data)
                 return extracted_data
             except json.JSONDecodeError:
-                print(f"Failed to parse extraction response as JSON: {response_text}")
+                logger.warning("Failed to parse extraction response as JSON: %r", response_text)
                 return {}
                 
         except Exception as e:
-            error_type = "deepseek_api_error" if self.using_deepseek else "gradio_api_error"
-            print(config.get_text(error_type, "Error in API call: {error}").format(error=str(e)))
+            self._log_api_error(e)
             return {}
 
     def evaluate_goal_completion(self, history: List[Dict[str, str]], current_goal: str, goal_prompt: str = ""):
@@ -268,95 +906,153 @@ class LLMClient:
         Evaluates if the user has completed the current goal based on their last message.
         Returns a response with GOAL_ACHIEVED: true/false and a conversational response.
         """
+        return llm_runner.run(self.evaluate_goal_completion_async(history, current_goal, goal_prompt))
+
+    @_on_llm_loop
+    async def evaluate_goal_completion_async(self, history: List[Dict[str, str]], current_goal: str, goal_prompt: str = ""):
+        """Async version of evaluate_goal_completion"""
         if not self.active:
             return f"GOAL_ACHIEVED: false\n{config.get_text('llm_not_configured_scenario', 'LLM client not configured.')}"
 
-        # Get the target language from configuration
-        language_info = config.get_language_info()
-        target_language = language_info["target_language_folder"].title()
-        
-        system_prompt = config.get_text(
-            "goal_evaluation_system_prompt",
-            "You are a language learning goal evaluator. Your ONLY task is to evaluate if the user has completed the following goal: '{goal}'. Respond with EXACTLY one line: GOAL_ACHIEVED: true (if completed) or GOAL_ACHIEVED: false (if not completed)."
-        ).format(goal=current_goal, target_language=target_language)
-        
-        messages = [{"role": "system", "content": system_prompt}] + history
-        
-        # Print the LLM input to console for debugging
-        print("\n" + "="*50)
-        print("GOAL EVALUATION INPUT:")
-        print("="*50)
-        print("SYSTEM PROMPT:")
-        print(system_prompt)
-        print("\nCONVERSATION HISTORY:")
-        for i, msg in enumerate(history):
-            print(f"{i+1}. {msg['role'].upper()}: {msg['content']}")
-        print("="*50 + "\n")
+        messages = self._build_goal_evaluation_messages(history, current_goal)
 
         try:
-            if self.using_deepseek and self.openai_client:
-                # Use DeepSeek API
-                response = self.openai_client.chat.completions.create(
-                    model=config.MODEL,
-                    messages=messages,
-                    max_tokens=150,
-                    temperature=0.7
-                )
-                response_text = response.choices[0].message.content
-            else:
-                # Use Gradio fallback
-                prompt = self._format_messages_for_gradio(messages)
-                response_text = self._call_gradio_client(prompt, max_tokens=150, temperature=0.7)
-            
-            # Print the LLM response to console for debugging
-            print("GOAL EVALUATION RESPONSE:")
-            print("-" * 30)
-            print(response_text)
-            print("-" * 30 + "\n")
-            
+            response_text = await self._complete(messages, get_call_profile("goal_evaluation"))
+            log_response("goal_evaluation", response_text)
             return response_text
         except Exception as e:
-            error_type = "deepseek_api_error" if self.using_deepseek else "gradio_api_error"
-            print(config.get_text(error_type, "Error in API call: {error}").format(error=str(e)))
+            self._log_api_error(e)
             original_error = str(e)
             return f"GOAL_ACHIEVED: false\n{original_error}\n\nUse your own API key to avoid connection issues!"
 
+    def stream_goal_evaluation(self, history: List[Dict[str, str]], current_goal: str, goal_prompt: str = ""):
+        """
+        Streaming version of evaluate_goal_completion: an async iterator of text chunks delivered in
+        the caller's event loop, so the GOAL_ACHIEVED line can be acted on as soon as it arrives.
+        """
+        return llm_runner.iterate_async(self._stream_goal_evaluation(history, current_goal, goal_prompt))
+
+    async def _stream_goal_evaluation(self, history: List[Dict[str, str]], current_goal: str, goal_prompt: str = ""):
+        if not self.active:
+            yield f"GOAL_ACHIEVED: false\n{config.get_text('llm_not_configured_scenario', 'LLM client not configured.')}"
+            return
+
+        messages = self._build_goal_evaluation_messages(history, current_goal)
+        streamed_any = False
+        try:
+            async for _, delta in self._stream(messages, get_call_profile("goal_evaluation")):
+                streamed_any = True
+                yield delta
+        except Exception as e:
+            self._log_api_error(e)
+            if not streamed_any:
+                yield f"GOAL_ACHIEVED: false\n{str(e)}\n\nUse your own API key to avoid connection issues!"
+
+    def evaluate_turn(self, history: List[Dict[str, str]], current_goal: str, extract_info: Dict[str, str]) -> Optional[TurnEvaluation]:
+        """
+        Evaluates goal completion and extracts the goal's extract_info fields in a single call.
+        Returns None if the response doesn't parse strictly, so callers can fall back to
+        extract_information + evaluate_goal_completion. API errors are raised: retrying them
+        as two more calls would only fail (or time out) twice more.
+        """
+        return llm_runner.run(self.evaluate_turn_async(history, current_goal, extract_info))
+
+    @_on_llm_loop
+    async def evaluate_turn_async(self, history: List[Dict[str, str]], current_goal: str, extract_info: Dict[str, str]) -> Optional[TurnEvaluation]:
+        """Async version of evaluate_turn"""
+        if not self.active or not extract_info:
+            return None
+
+        system_prompt = prompt_compiler.compile("turn_evaluation", goal=current_goal, extract_info=extract_info)
+
+        messages = [{"role": "system", "content": system_prompt}] + history
+
+        try:
+            response_text = await self._complete(messages, get_call_profile("turn_evaluation"))
+        except Exception as e:
+            self._log_api_error(e)
+            raise
+
+        evaluation = self._parse_turn_evaluation(response_text, extract_info)
+        if evaluation is None:
+            logger.warning("Failed to parse turn evaluation response: %r", response_text)
+        return evaluation
+
+    def _parse_turn_evaluation(self, response_text: str, extract_info: Dict[str, str]) -> Optional[TurnEvaluation]:
+        """Parses a combined turn response, rejecting anything but the exact expected shape"""
+        match = _TURN_RESPONSE_PATTERN.match((response_text or "").strip())
+        if not match:
+            return None
+        try:
+            extracted = json.loads(match.group(2))
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(extracted, dict) or set(extracted) != set(extract_info):
+            return None
+        return TurnEvaluation(goal_achieved=match.group(1) == "true", extracted_info=extracted)
+
     def get_correction(self, user_answer: str, prompt_question: str):
+        return llm_runner.run(self.get_correction_async(user_answer, prompt_question))
+
+    @_on_llm_loop
+    async def get_correction_async(self, user_answer: str, prompt_question: str):
+        """Async version of get_correction"""
         if not self.active:
             return config.get_text("llm_not_configured", "LLM client not configured. Please check your connection.")
 
-        system_prompt = config.get_text(
-            "correction_system_prompt",
-            "You are a friendly and concise language teacher. The user is learning and will give you an answer to a question. Your task is to: \n1. Evaluate if the user\'s answer is correct for the given question.\n2. If it is correct, praise them briefly (e.g., 'Perfect!', 'Very good!').\n3. If it is incorrect, correct them simply and directly, explaining the reason for the error in a single sentence.\nAlways respond in the UI language."
-        )
-
-        user_message = config.get_text(
-            "correction_question_template",
-            "The question was: '{question}'. My answer was: '{answer}'."
-        ).format(question=prompt_question, answer=user_answer)
+        messages = self._build_correction_messages(user_answer, prompt_question)
+        cached = await response_cache.get_async(self._cache_key("get_correction", messages[0]["content"], messages[1]["content"]))
+        if cached is not None:
+            return cached
 
         try:
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-            
-            if self.using_deepseek and self.openai_client:
-                # Use DeepSeek API
-                response = self.openai_client.chat.completions.create(
-                    model=config.MODEL,
-                    messages=messages,
-                    max_tokens=100,
-                    temperature=0.7
-                )
-                response_text = response.choices[0].message.content
-            else:
-                # Use Gradio fallback
-                prompt = self._format_messages_for_gradio(messages)
-                response_text = self._call_gradio_client(prompt, max_tokens=100, temperature=0.7)
+            response_text, backend = await self._complete_answered(messages, get_call_profile("correction"))
+            if response_text:
+                response_cache.set(self._cache_key("get_correction", messages[0]["content"], messages[1]["content"], backend), response_text)
             
             return response_text
         except Exception as e:
-            error_type = "deepseek_api_error" if self.using_deepseek else "gradio_api_error"
-            print(config.get_text(error_type, "Error in API call: {error}").format(error=str(e)))
-            return config.get_text("api_error", "There was an error contacting the AI service.")
\ No newline at end of file
+            self._log_api_error(e)
+            return config.get_text("api_error", "There was an error contacting the AI service.")
+
+    def stream_correction(self, user_answer: str, prompt_question: str):
+        """
+        Streaming version of get_correction: an async iterator of text chunks delivered in the
+        caller's event loop. Closing it early (or cancelling the consumer) aborts the request.
+        """
+        return llm_runner.iterate_async(self._stream_correction(user_answer, prompt_question))
+
+    async def _stream_correction(self, user_answer: str, prompt_question: str):
+        if not self.active:
+            yield config.get_text("llm_not_configured", "LLM client not configured. Please check your connection.")
+            return
+
+        messages = self._build_correction_messages(user_answer, prompt_question)
+        cached = await response_cache.get_async(self._cache_key("get_correction", messages[0]["content"], messages[1]["content"]))
+        if cached is not None:
+            yield cached
+            return
+
+        response_text = ""
+        backend = None
+        try:
+            async for backend, delta in self._stream(messages, get_call_profile("correction")):
+                response_text += delta
+                yield delta
+        except Exception as e:
+            self._log_api_error(e)
+            error_text = config.get_text("api_error", "There was an error contacting the AI service.")
+            yield f"\n{error_text}" if response_text else error_text
+            return
+        if response_text:
+            response_cache.set(self._cache_key("get_correction", messages[0]["content"], messages[1]["content"], backend), response_text)
+
+    def _build_correction_messages(self, user_answer: str, prompt_question: str) -> List[Dict[str, str]]:
+        user_message = config.get_text(
+            "correction_question_template",
+            "The question was: '{question}'. My answer was: '{answer}'."
+        ).format(question=prompt_question, answer=user_answer)
+        return [
+            {"role": "system", "content": prompt_compiler.compile("correction")},
+            {"role": "user", "content": user_message}
+        ]
\ No newline at end of file
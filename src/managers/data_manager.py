@@ -3,6 +3,7 @@ import json
 import os
 import src.config as config
 from src.managers.user_data_manager import user_data_manager
+from src.prompt_compiler import prompt_compiler
 
 class DataManager:
     def __init__(self):
@@ -22,6 +23,8 @@ class DataManager:
         """Reloads the lessons from the disk."""
         self.lessons_folder = config.get_lessons_folder()
         self.lessons_data = self.load_lessons()
+        # Compiled prompts embed lesson concepts and goals
+        prompt_compiler.invalidate()
     
     def load_lessons(self):
         """Loads lessons from individual JSON files in the language-specific folder."""
@@ -10,10 +10,12 @@ class ProgressManager:
         self.user_data = user_data_manager.get_progress('user_data', {})
 
     def save_progress(self):
-        user_data_manager.set_progress('completed_lessons', list(self.completed_lessons))
-        user_data_manager.set_progress('interactive_scenario_progress', self.interactive_scenario_progress)
-        user_data_manager.set_progress('lesson_slide_positions', self.lesson_slide_positions)
-        user_data_manager.set_progress('user_data', self.user_data)
+        # One write for all four keys
+        with user_data_manager.batch():
+            user_data_manager.set_progress('completed_lessons', list(self.completed_lessons))
+            user_data_manager.set_progress('interactive_scenario_progress', self.interactive_scenario_progress)
+            user_data_manager.set_progress('lesson_slide_positions', self.lesson_slide_positions)
+            user_data_manager.set_progress('user_data', self.user_data)
 
     def mark_lesson_completed(self, lesson_id: str):
         """Marca una lección como completada."""
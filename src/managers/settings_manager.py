@@ -13,27 +13,28 @@ class SettingsManager:
             status_message.color = ft.Colors.RED
         else:
             try:
-                # First validate the API key
-                if self.llm_client and self.llm_client.validate_api_key(api_key):
-                    # API key is valid - save it and use DeepSeek
-                    config.save_user_api_key(api_key)
+                # Validate once: a clear result is cached, so update_api_key() below reuses it, and an
+                # inconclusive one is handed over so the background recheck doesn't repeat it at once
+                is_valid = self.llm_client.validate_api_key(api_key) if self.llm_client else False
+
+                config.save_user_api_key(api_key)
+                config.update_runtime_api_key(api_key)
+
+                if self.llm_client:
+                    self.llm_client.update_api_key(inconclusive=is_valid is None)
+
+                if is_valid:
+                    # API key is valid - use DeepSeek
                     status_message.value = config.get_text("api_key_saved_deepseek", "API key saved successfully! Using DeepSeek API.")
                     status_message.color = ft.Colors.GREEN
-                    
-                    config.update_runtime_api_key(api_key)
-                    
-                    if self.llm_client:
-                        self.llm_client.update_api_key()
+                elif is_valid is None:
+                    # The service didn't answer clearly (timeout, rate limit); the key is used and re-checked later
+                    status_message.value = config.get_text("api_key_saved_unverified", "API key saved, but it couldn't be verified right now. Using DeepSeek API; it will be checked again.")
+                    status_message.color = ft.Colors.ORANGE
                 else:
-                    # API key is invalid - still save it but warn user
-                    config.save_user_api_key(api_key)
+                    # API key is invalid - it is still saved, but warn the user
                     status_message.value = config.get_text("api_key_saved_fallback", "API key saved but validation failed. Using Gradio fallback.")
                     status_message.color = ft.Colors.ORANGE
-                    
-                    config.update_runtime_api_key(api_key)
-                    
-                    if self.llm_client:
-                        self.llm_client.update_api_key()
                 
             except Exception as ex:
                 status_message.value = config.get_text("api_key_save_error", "Error saving API key: {error}").format(error=str(ex))
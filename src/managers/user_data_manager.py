@@ -1,27 +1,158 @@
 # user_data_manager.py
+import atexit
 import json
 import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Write-behind window (seconds): changes are marked dirty and written together by a background
+# thread at most this long after the first one. 0 writes synchronously on every change.
+# (Kept here rather than in config.py, which imports this module.)
+WRITE_BEHIND_DELAY = float(os.getenv("USER_DATA_WRITE_DELAY", "0.5"))
 
 class UserDataManager:
-    def __init__(self, file_path="user_data.json"):
+    def __init__(self, file_path="user_data.json", write_delay=WRITE_BEHIND_DELAY):
         self.file_path = file_path
+        self.write_delay = write_delay
         self.data = self._load_data()
+        self.write_count = 0  # file writes so far, for benchmarks and diagnostics
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._dirty = False
+        self._batch_depth = 0
+        self._closed = False
+        self._flusher = None
+        atexit.register(self.close)
+
+    @property
+    def backup_path(self):
+        return f"{self.file_path}.bak"
 
     def _load_data(self):
         if not os.path.exists(self.file_path):
-            return self._get_default_data()
+            # A crash between the two renames of a write leaves only the backup
+            return self._load_backup() or self._get_default_data()
         try:
             with open(self.file_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return self._get_default_data()
+        except (OSError, ValueError) as e:
+            print(f"User data file is unreadable ({e}); trying the backup")
+            # Keep the damaged file for inspection instead of overwriting it on the next write
+            try:
+                os.replace(self.file_path, f"{self.file_path}.corrupt")
+            except OSError:
+                pass
+            return self._load_backup() or self._get_default_data()
+
+    def _load_backup(self):
+        if not os.path.exists(self.backup_path):
+            return None
+        try:
+            with open(self.backup_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            print(f"Restored user data from {self.backup_path}")
+            return data
+        except (OSError, ValueError) as e:
+            print(f"User data backup is unreadable too: {e}")
+            return None
 
     def _save_data(self):
+        """Marks the data dirty; the write happens after the write-behind window or when the batch ends"""
+        with self._lock:
+            self._dirty = True
+            if self._batch_depth:
+                return
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self.write_delay <= 0 or self._closed:
+            self.flush()
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="user-data-flush", daemon=True)
+                self._flusher.start()
+            self._changed.notify()
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while not self._dirty and not self._closed:
+                    self._changed.wait()
+                if self._closed:
+                    return
+            # Let the changes of the next few moments join this write
+            time.sleep(self.write_delay)
+            self.flush()
+
+    def flush(self):
+        """Writes pending changes now (no-op when nothing changed)"""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                try:
+                    payload = json.dumps(self.data, ensure_ascii=False, indent=2)
+                except RuntimeError:
+                    # A caller is mutating a shared progress dict right now; the next flush picks it up
+                    return
+                self._dirty = False
+            try:
+                self._write_atomic(payload)
+                self.write_count += 1
+            except Exception as e:
+                print(f"Error saving user data: {e}")
+
+    def _write_atomic(self, payload):
+        """
+        Writes to a temp file, fsyncs it and renames it over the data file, keeping the previous
+        version as the .bak. A crash at any point leaves a complete file or backup behind.
+        """
+        temp_path = f"{self.file_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(self.file_path):
+            os.replace(self.file_path, self.backup_path)
+        os.replace(temp_path, self.file_path)
+        self._fsync_directory()
+
+    def _fsync_directory(self):
+        # Makes the renames durable; directories can't be opened this way on Windows
+        if os.name == "nt":
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.file_path)), os.O_RDONLY)
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error saving user data: {e}")
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @contextmanager
+    def batch(self):
+        """Groups several set_* calls into a single write"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                pending = self._dirty and not self._batch_depth
+            if pending:
+                self._schedule_flush()
+
+    def close(self):
+        """Stops the background writer and writes anything still pending; runs at exit"""
+        with self._lock:
+            self._closed = True
+            self._changed.notify()
+        if self._flusher is not None:
+            self._flusher.join(timeout=max(1.0, self.write_delay * 2))
+            self._flusher = None
+        self.flush()
 
     def _get_default_data(self):
         return {
@@ -41,27 +172,30 @@ class UserDataManager:
         return self.data.get("settings", {}).get(key, default)
 
     def set_setting(self, key, value):
-        if "settings" not in self.data:
-            self.data["settings"] = {}
-        self.data["settings"][key] = value
+        with self._lock:
+            if "settings" not in self.data:
+                self.data["settings"] = {}
+            self.data["settings"][key] = value
         self._save_data()
 
     def get_progress(self, key, default=None):
         return self.data.get("progress", {}).get(key, default)
 
     def set_progress(self, key, value):
-        if "progress" not in self.data:
-            self.data["progress"] = {}
-        self.data["progress"][key] = value
+        with self._lock:
+            if "progress" not in self.data:
+                self.data["progress"] = {}
+            self.data["progress"][key] = value
         self._save_data()
 
     def get_app_data(self, key, default=None):
         return self.data.get("app_data", {}).get(key, default)
 
     def set_app_data(self, key, value):
-        if "app_data" not in self.data:
-            self.data["app_data"] = {}
-        self.data["app_data"][key] = value
+        with self._lock:
+            if "app_data" not in self.data:
+                self.data["app_data"] = {}
+            self.data["app_data"][key] = value
         self._save_data()
 
 
@@ -0,0 +1,115 @@
+# prompt_compiler.py
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+import src.config as config
+
+
+def _freeze(value: Any):
+    """Turns prompt parameters into a hashable cache key, preserving order (it affects the prompt text)."""
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class PromptCompiler:
+    """
+    Builds each LLM system prompt once per (UI language, target language, prompt kind and its
+    lesson/scenario/goal parameters) and serves the cached string afterwards. Reusing the exact
+    same string keeps the system prefix byte-identical across turns, so provider-side prefix
+    caching applies too. The cache is dropped whenever the language changes (via
+    config.get_language_version()) or the lessons are reloaded.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._language_version = None
+        self._language_info = None
+        self._lock = threading.Lock()
+        self._builders = {
+            "scenario": self._build_scenario,
+            "goal_evaluation": self._build_goal_evaluation,
+            "extraction": self._build_extraction,
+            "turn_evaluation": self._build_turn_evaluation,
+            "correction": self._build_correction,
+        }
+
+    def compile(self, kind: str, **params) -> str:
+        """Returns the system prompt of the given kind for params, building it on first use."""
+        with self._lock:
+            version = config.get_language_version()
+            if version != self._language_version:
+                self._cache.clear()
+                self._language_info = None
+                self._language_version = version
+
+            key = (kind, _freeze(params))
+            prompt = self._cache.get(key)
+            if prompt is not None:
+                self._cache.move_to_end(key)
+                return prompt
+
+            prompt = self._builders[kind](**params)
+            self._cache[key] = prompt
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            return prompt
+
+    def invalidate(self):
+        """Drops every compiled prompt, e.g. after the lesson data was reloaded."""
+        with self._lock:
+            self._cache.clear()
+            self._language_info = None
+
+    def _get_language_info(self) -> Dict[str, str]:
+        if self._language_info is None:
+            self._language_info = config.get_language_info()
+        return self._language_info
+
+    def _build_scenario(self, concepts: Dict[str, str]) -> str:
+        target_language = self._get_language_info()["target_language_folder"].title()
+        # Concept usage is detected locally (ConceptIndex); the LLM only needs the allowed phrases
+        concepts_json_str = json.dumps(list(concepts.values()), ensure_ascii=False)
+        return config.get_text(
+            "scenario_reply_system_prompt",
+            "You are a language assistant. Your main goal is to have a natural conversation in {target_language} with the user to help them practice.\n\nCRITICAL CONSTRAINT: In your responses, you can ONLY use words and phrases from the following lesson concepts: {concepts}. Do not use any {target_language} words that are not on this list. If you need to communicate something that is not in the concepts, use Spanish or English.\n\nReply with your conversational response only."
+        ).format(target_language=target_language, concepts=concepts_json_str)
+
+    def _build_goal_evaluation(self, goal: str) -> str:
+        target_language = self._get_language_info()["target_language_folder"].title()
+        return config.get_text(
+            "goal_evaluation_system_prompt",
+            "You are a language learning goal evaluator. Your ONLY task is to evaluate if the user has completed the following goal: '{goal}'. Respond with EXACTLY one line: GOAL_ACHIEVED: true (if completed) or GOAL_ACHIEVED: false (if not completed)."
+        ).format(goal=goal, target_language=target_language)
+
+    def _build_extraction(self, extract_info: Dict[str, str]) -> str:
+        target_language = self._get_language_info()["target_language_code"].title()
+        # Build extraction instructions
+        instructions_text = "\n".join(f"- {key}: {description}" for key, description in extract_info.items())
+        return config.get_text(
+            "info_extraction_system_prompt",
+            "You are an information extraction assistant. The user is learning {target_language}. Extract the following information from the user's message:\n\n{instructions}\n\nRespond with ONLY a JSON object containing the extracted values. If you cannot extract a value, use null. Example: {{\"user_name\": \"John\", \"age\": null}}"
+        ).format(target_language=target_language, instructions=instructions_text)
+
+    def _build_turn_evaluation(self, goal: str, extract_info: Dict[str, str]) -> str:
+        target_language = self._get_language_info()["target_language_folder"].title()
+        instructions_text = "\n".join(f"- {key}: {description}" for key, description in extract_info.items())
+        example_json = json.dumps({key: None for key in extract_info})
+        return config.get_text(
+            "turn_evaluation_system_prompt",
+            "You are a language learning goal evaluator and information extractor. The user is learning {target_language}.\n\n1. Evaluate if the user has completed the following goal: '{goal}'.\n2. Extract the following information from the user's last message:\n{instructions}\n\nRespond with EXACTLY two lines and nothing else:\nGOAL_ACHIEVED: true (if completed) or GOAL_ACHIEVED: false (if not completed)\nEXTRACTED: a JSON object with exactly these keys, using null for any value you cannot extract: {example}"
+        ).format(target_language=target_language, goal=goal, instructions=instructions_text, example=example_json)
+
+    def _build_correction(self) -> str:
+        return config.get_text(
+            "correction_system_prompt",
+            "You are a friendly and concise language teacher. The user is learning and will give you an answer to a question. Your task is to: \n1. Evaluate if the user\'s answer is correct for the given question.\n2. If it is correct, praise them briefly (e.g., 'Perfect!', 'Very good!').\n3. If it is incorrect, correct them simply and directly, explaining the reason for the error in a single sentence.\nAlways respond in the UI language."
+        )
+
+
+# Global instance
+prompt_compiler = PromptCompiler()
@@ -0,0 +1,121 @@
+# services/answer_grader.py
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import List, Optional
+import src.config as config
+
+CORRECT = "correct"
+INCORRECT = "incorrect"
+AMBIGUOUS = "ambiguous"
+
+
+def normalize_answer(text: str) -> str:
+    """Case-folds, strips accents and punctuation and collapses whitespace."""
+    text = unicodedata.normalize("NFKD", text or "").casefold()
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[^\w\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def similarity(a: str, b: str) -> float:
+    """1.0 for identical strings, 0.0 for completely different ones."""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    return 1 - edit_distance(a, b) / longest
+
+
+@dataclass
+class GradeResult:
+    """Local verdict for an llm_check answer."""
+    verdict: str
+    similarity: float = 0.0
+    expected: Optional[str] = None
+    feedback: str = ""
+
+    @property
+    def is_decisive(self) -> bool:
+        return self.verdict != AMBIGUOUS
+
+
+class AnswerGrader:
+    """
+    Grades llm_check answers against the slide's `expected_answers` before asking the LLM.
+    Clearly correct and clearly wrong answers get an instant verdict; only the ambiguous
+    ones (or slides without expected answers) need an LLM correction.
+    """
+
+    def __init__(self, accept_similarity: float = 0.85, reject_similarity: float = 0.35):
+        self.accept_similarity = accept_similarity
+        self.reject_similarity = reject_similarity
+        self._lock = threading.Lock()
+        self.local_verdicts = 0
+        self.llm_fallbacks = 0
+
+    def grade(self, user_answer: str, expected_answers: Optional[List[str]]) -> GradeResult:
+        result = self._grade(user_answer, expected_answers or [])
+        with self._lock:
+            if result.is_decisive:
+                self.local_verdicts += 1
+            else:
+                self.llm_fallbacks += 1
+        return result
+
+    def _grade(self, user_answer: str, expected_answers: List[str]) -> GradeResult:
+        answer = normalize_answer(user_answer)
+        if not answer or not expected_answers:
+            return GradeResult(AMBIGUOUS)
+
+        # Ties go to the first listed answer, which is the one shown in feedback
+        best_score, best_expected = max(
+            ((similarity(answer, normalize_answer(expected)), expected) for expected in expected_answers),
+            key=lambda scored: scored[0]
+        )
+
+        if best_score == 1.0:
+            feedback = config.get_text("local_grade_correct", "Perfect!")
+            return GradeResult(CORRECT, best_score, best_expected, feedback)
+        if best_score >= self.accept_similarity:
+            feedback = config.get_text(
+                "local_grade_almost", "Very good! Watch the spelling: {expected}"
+            ).format(expected=best_expected)
+            return GradeResult(CORRECT, best_score, best_expected, feedback)
+        if best_score <= self.reject_similarity:
+            feedback = config.get_text(
+                "local_grade_incorrect", "Not quite. A correct answer would be: {expected}"
+            ).format(expected=best_expected)
+            return GradeResult(INCORRECT, best_score, best_expected, feedback)
+        return GradeResult(AMBIGUOUS, best_score, best_expected)
+
+    def stats(self) -> dict:
+        """Returns how many answers were graded locally and the share of LLM calls avoided."""
+        with self._lock:
+            total = self.local_verdicts + self.llm_fallbacks
+            return {
+                "local_verdicts": self.local_verdicts,
+                "llm_fallbacks": self.llm_fallbacks,
+                "llm_calls_avoided_pct": 100.0 * self.local_verdicts / total if total else 0.0,
+            }
+
+
+# Global instance
+answer_grader = AnswerGrader(config.LOCAL_GRADER_ACCEPT_SIMILARITY, config.LOCAL_GRADER_REJECT_SIMILARITY)
@@ -0,0 +1,182 @@
+# services/backend_router.py
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BackendHealth:
+    """Rolling latency/error statistics and a circuit breaker for one LLM backend."""
+
+    def __init__(self, name: str, window: int = 50, failure_threshold: int = 3, open_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.total_requests = 0
+        self.total_failures = 0
+        self.last_error: Optional[str] = None
+
+    def is_available(self, now: float) -> bool:
+        """Whether the backend may be tried, without claiming the half-open probe slot."""
+        if self.state == OPEN:
+            return now - self.opened_at >= self.open_seconds
+        if self.state == HALF_OPEN:
+            return not self.probe_in_flight
+        return True
+
+    def awaiting_probe(self, now: float) -> bool:
+        """Whether the circuit's cooldown is over and nobody has claimed the half-open probe yet."""
+        return self.state != CLOSED and self.is_available(now)
+
+    def allow_request(self, now: float) -> bool:
+        """Whether a request may be sent. An open circuit lets a single probe through after its cooldown."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if now - self.opened_at < self.open_seconds:
+                return False
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+        if self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+
+    def record_success(self, latency: float):
+        if self.state != CLOSED:
+            # Recovered: the samples of the outage would keep ranking it behind slower backends
+            self.latencies.clear()
+            self.outcomes.clear()
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.total_requests += 1
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.probe_in_flight = False
+
+    def record_failure(self, latency: float, error: Exception, now: float):
+        self.latencies.append(latency)
+        self.outcomes.append(False)
+        self.total_requests += 1
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self.last_error = type(error).__name__
+        self.probe_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = now
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "samples": len(self.latencies),
+            "p50_latency": self.latency_percentile(50),
+            "p95_latency": self.latency_percentile(95),
+            "error_rate": self.error_rate,
+            "consecutive_failures": self.consecutive_failures,
+            "total_requests": self.total_requests,
+            "total_failures": self.total_failures,
+            "last_error": self.last_error,
+        }
+
+
+class BackendRouter:
+    """
+    Orders LLM backends for each request. Backends with an open circuit are skipped,
+    and a lower-preference backend is tried first only when it has proven clearly
+    faster and healthier than the preferred one. Once a circuit's cooldown is over, the
+    next request tries that backend first as the half-open probe.
+    """
+
+    def __init__(self, window: int = 50, failure_threshold: int = 3, open_seconds: float = 30.0,
+                 min_samples: int = 5, preference_bias: float = 2.0):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.min_samples = min_samples
+        self.preference_bias = preference_bias
+        self._backends: Dict[str, BackendHealth] = {}
+        self._lock = threading.Lock()
+
+    def _health(self, name: str) -> BackendHealth:
+        health = self._backends.get(name)
+        if health is None:
+            health = BackendHealth(name, self.window, self.failure_threshold, self.open_seconds)
+            self._backends[name] = health
+        return health
+
+    def _score(self, health: BackendHealth, rank: int) -> float:
+        """Lower is better: median latency inflated by the error rate and by distance from the preferred backend."""
+        if len(health.latencies) < self.min_samples:
+            return float(rank)  # not enough data yet, keep the preference order
+        median = health.latency_percentile(50)
+        return median * (1 + 4 * health.error_rate) * (self.preference_bias ** rank)
+
+    def route(self, candidates: List[str]) -> List[str]:
+        """
+        Returns the backends worth trying, in order, out of candidates (given in preference order).
+        Call acquire() right before sending to each one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healths = [self._health(name) for name in candidates]
+            if all(len(h.latencies) >= self.min_samples for h in healths):
+                ranked = sorted(enumerate(healths), key=lambda item: self._score(item[1], item[0]))
+            else:
+                ranked = list(enumerate(healths))
+            # Probe recovering backends first; otherwise their ranking could keep them from ever being tried
+            ranked.sort(key=lambda item: not item[1].awaiting_probe(now))
+            return [health.name for _, health in ranked if health.is_available(now)]
+
+    def acquire(self, name: str) -> bool:
+        """Claims permission to send a request right now; an open circuit admits one probe after its cooldown."""
+        with self._lock:
+            return self._health(name).allow_request(time.monotonic())
+
+    def release(self, name: str):
+        """Gives back a claimed probe slot when the request was abandoned (e.g. cancelled) without an outcome."""
+        with self._lock:
+            self._health(name).probe_in_flight = False
+
+    def record_success(self, name: str, latency: float):
+        with self._lock:
+            self._health(name).record_success(latency)
+
+    def record_failure(self, name: str, latency: float, error: Exception):
+        with self._lock:
+            self._health(name).record_failure(latency, error, time.monotonic())
+
+    def latency_percentile(self, name: str, percentile: float) -> Optional[float]:
+        """Rolling latency percentile of a backend, or None until it has min_samples calls."""
+        with self._lock:
+            health = self._health(name)
+            if len(health.latencies) < self.min_samples:
+                return None
+            return health.latency_percentile(percentile)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: health.snapshot() for name, health in self._backends.items()}
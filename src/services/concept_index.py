@@ -0,0 +1,80 @@
+# services/concept_index.py
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+from src.services.answer_grader import edit_distance, normalize_answer
+
+
+class ConceptIndex:
+    """
+    Token/n-gram index over a lesson's concepts ({item_id: concept text}) that detects which
+    concepts a user message uses, locally. Matching is deliberately lenient, like the LLM was
+    asked to be: close forms of a word (one edit away) count, and a multi-word phrase counts
+    when most of its words appear.
+    """
+
+    def __init__(self, concepts: Dict[str, str], min_phrase_coverage: float = 0.6, fuzzy_min_length: int = 4):
+        self.min_phrase_coverage = min_phrase_coverage
+        self.fuzzy_min_length = fuzzy_min_length
+        self._concept_tokens: Dict[str, List[str]] = {}
+        self._postings: Dict[str, set] = {}
+        for item_id, text in concepts.items():
+            tokens = normalize_answer(str(text)).split()
+            if not tokens:
+                continue
+            self._concept_tokens[item_id] = tokens
+            for token in tokens:
+                self._postings.setdefault(token, set()).add(item_id)
+
+    def _match_tokens(self, message_tokens: List[str]) -> set:
+        """Maps the message tokens to indexed tokens, allowing one edit on longer words."""
+        matched = set()
+        for token in message_tokens:
+            if token in self._postings:
+                matched.add(token)
+            elif len(token) >= self.fuzzy_min_length:
+                matched.update(
+                    known for known in self._postings
+                    if abs(len(known) - len(token)) <= 1 and known[0] == token[0] and edit_distance(known, token) <= 1
+                )
+        return matched
+
+    def find_covered(self, message: str) -> List[str]:
+        """Returns the item_ids of the concepts used in message, in index order."""
+        message_tokens = normalize_answer(message).split()
+        if not message_tokens:
+            return []
+        matched = self._match_tokens(message_tokens)
+
+        candidates = set()
+        for token in matched:
+            candidates.update(self._postings[token])
+
+        covered = []
+        for item_id, tokens in self._concept_tokens.items():
+            if item_id not in candidates:
+                continue
+            hits = sum(1 for token in tokens if token in matched)
+            if hits / len(tokens) >= self.min_phrase_coverage:
+                covered.append(item_id)
+        return covered
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_concept_index(concepts: Dict[str, str]) -> ConceptIndex:
+    """Returns the index for this set of concepts, building it once per distinct content."""
+    key = tuple(concepts.items())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = ConceptIndex(concepts)
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > 32:
+            _indexes.popitem(last=False)
+    return index
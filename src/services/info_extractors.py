@@ -0,0 +1,116 @@
+# services/info_extractors.py
+import re
+from typing import Any, Callable, Dict, Optional
+from src.utils.llm_logging import logger
+
+# A goal can map its extract_info keys to local extractors, e.g.
+#   "extract_info": {"user_name": "The user's name", "age": "The user's age"},
+#   "extractors": {"user_name": "name", "age": "integer"}
+# Extractors are looked up by name; "regex:<pattern>" uses the first group (or whole match).
+# Values an extractor can't find stay null and are left to the LLM.
+
+Extractor = Callable[[str], Optional[Any]]
+
+_extractors: Dict[str, Extractor] = {}
+
+
+def register_extractor(name: str):
+    """Decorator that registers a local extractor under name."""
+    def decorator(fn: Extractor) -> Extractor:
+        _extractors[name] = fn
+        return fn
+    return decorator
+
+
+def get_extractor(spec: str) -> Optional[Extractor]:
+    """Returns the extractor for a registered name or a "regex:<pattern>" spec."""
+    if spec.startswith("regex:"):
+        pattern = re.compile(spec[len("regex:"):], re.IGNORECASE)
+
+        def extract_regex(message: str):
+            match = pattern.search(message)
+            if not match:
+                return None
+            return (match.group(1) if match.groups() else match.group(0)).strip()
+        return extract_regex
+    return _extractors.get(spec)
+
+
+def run_extractors(user_message: str, extract_info: Dict[str, str], extractors: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Returns every extract_info key with its locally extracted value, or None where nothing was found."""
+    results = {key: None for key in extract_info}
+    for key, spec in (extractors or {}).items():
+        if key not in results:
+            continue
+        extractor = get_extractor(spec)
+        if extractor is None:
+            logger.warning("Unknown extractor '%s' for '%s'", spec, key)
+            continue
+        try:
+            results[key] = extractor(user_message)
+        except Exception:
+            logger.exception("Extractor '%s' failed for '%s'", spec, key)
+    return results
+
+
+@register_extractor("integer")
+def extract_integer(message: str) -> Optional[int]:
+    match = re.search(r"(?<![\d.,])-?\d+(?![\d.,]\d)", message)
+    return int(match.group(0)) if match else None
+
+
+@register_extractor("number")
+def extract_number(message: str) -> Optional[float]:
+    match = re.search(r"-?\d+(?:[.,]\d+)?", message)
+    return float(match.group(0).replace(",", ".")) if match else None
+
+
+_YES_WORDS = {"yes", "yeah", "yep", "ja", "jawel", "si", "sí", "oui", "sim", "da", "evet", "はい", "네", "是"}
+_NO_WORDS = {"no", "nope", "nee", "nein", "non", "não", "nao", "niet", "hayır", "いいえ", "아니요", "不"}
+
+
+@register_extractor("yes_no")
+def extract_yes_no(message: str) -> Optional[bool]:
+    words = set(re.findall(r"\w+", message.casefold()))
+    has_yes = bool(words & _YES_WORDS)
+    has_no = bool(words & _NO_WORDS)
+    if has_yes == has_no:
+        return None  # neither, or both: too ambiguous to decide locally
+    return has_yes
+
+
+_NAME_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r"\bmy name is\s+(\w[\w'-]*)",
+        r"\bi am\s+([A-Z][\w'-]*)",
+        r"\bi'm\s+([A-Z][\w'-]*)",
+        r"\bmijn naam is\s+(\w[\w'-]*)",
+        r"\bik heet\s+(\w[\w'-]*)",
+        r"\bik ben\s+([A-Z][\w'-]*)",
+        r"\bme llamo\s+(\w[\w'-]*)",
+        r"\bmi nombre es\s+(\w[\w'-]*)",
+        r"\bsoy\s+([A-Z][\w'-]*)",
+        r"\bje m'appelle\s+(\w[\w'-]*)",
+        r"\bich heiße\s+(\w[\w'-]*)",
+        r"\bich heisse\s+(\w[\w'-]*)",
+        r"\bmi chiamo\s+(\w[\w'-]*)",
+        r"\bme chamo\s+(\w[\w'-]*)",
+    )
+]
+
+
+@register_extractor("name")
+def extract_name(message: str) -> Optional[str]:
+    for pattern in _NAME_PATTERNS:
+        match = pattern.search(message)
+        # Patterns after "I am"/"ik ben"/"soy" need a capitalized word, so "ik ben moe" isn't a name
+        if match and (match.group(1)[0].isupper() or "[A-Z]" not in pattern.pattern):
+            name = match.group(1)
+            return name[0].upper() + name[1:]
+    return None
+
+
+@register_extractor("email")
+def extract_email(message: str) -> Optional[str]:
+    match = re.search(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+", message)
+    return match.group(0) if match else None
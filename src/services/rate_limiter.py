@@ -0,0 +1,190 @@
+# services/rate_limiter.py
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Optional
+import src.config as config
+
+DEFAULT_SESSION = "default"
+
+
+class TokenBucket:
+    """Classic token bucket: holds up to capacity units and refills rate units per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount units are available (0 if they are now)."""
+        self._refill(now)
+        # A request larger than the bucket only needs it to be full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+
+class _Waiter:
+    __slots__ = ("session_id", "tokens", "future", "enqueued")
+
+    def __init__(self, session_id: str, tokens: int, future: asyncio.Future):
+        self.session_id = session_id
+        self.tokens = tokens
+        self.future = future
+        self.enqueued = time.monotonic()
+
+
+class LLMRateLimiter:
+    """
+    Process-wide admission control for LLM requests: a requests/second bucket, a tokens/minute
+    bucket and a cap on concurrent requests. Waiting requests are queued per session and
+    admitted round-robin, so one busy session can't starve the others.
+
+    acquire()/release() must run on the llm_runner loop; queue_status() and stats() may be
+    called from any thread.
+    """
+
+    def __init__(self, requests_per_second: Optional[float] = None, burst: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_concurrency: Optional[int] = None):
+        self.request_bucket = TokenBucket(requests_per_second, burst or max(1.0, requests_per_second)) if requests_per_second else None
+        self.token_bucket = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._timer = None
+        self.admitted = 0
+        self.total_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self, session_id: Optional[str], tokens: int):
+        """Holds an admission slot for the duration of one LLM request."""
+        await self.acquire(session_id, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, session_id: Optional[str], tokens: int):
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(session_id or DEFAULT_SESSION, tokens, loop.create_future())
+        with self._lock:
+            self._queues.setdefault(waiter.session_id, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                queue = self._queues.get(waiter.session_id)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self._queues[waiter.session_id]
+                    waiter = None
+            if waiter is not None:
+                # Admitted just before the cancellation: give the slot back
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admits queued requests, one per session in turn, while the limits allow it."""
+        retry_in = None
+        with self._lock:
+            while self._queues:
+                if self.max_concurrency and self.in_flight >= self.max_concurrency:
+                    break  # release() dispatches again
+                session_id, queue = next(iter(self._queues.items()))
+                waiter = queue[0]
+                if waiter.future.done():
+                    queue.popleft()
+                    self._drop_if_empty(session_id, queue)
+                    continue
+
+                now = time.monotonic()
+                wait = 0.0
+                if self.request_bucket:
+                    wait = max(wait, self.request_bucket.wait_time(1, now))
+                if self.token_bucket:
+                    wait = max(wait, self.token_bucket.wait_time(waiter.tokens, now))
+                if wait > 0:
+                    retry_in = wait
+                    break
+
+                if self.request_bucket:
+                    self.request_bucket.consume(1, now)
+                if self.token_bucket:
+                    self.token_bucket.consume(waiter.tokens, now)
+                queue.popleft()
+                # Round-robin: this session goes to the back of the line
+                self._queues.move_to_end(session_id)
+                self._drop_if_empty(session_id, queue)
+                self.in_flight += 1
+                self.admitted += 1
+                self.total_wait += now - waiter.enqueued
+                waiter.future.set_result(None)
+
+        if retry_in is not None and self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(retry_in, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    def _drop_if_empty(self, session_id: str, queue: deque):
+        if not queue:
+            del self._queues[session_id]
+
+    def queue_status(self, session_id: Optional[str]) -> dict:
+        """Queue depth and how long this session's oldest request has been waiting."""
+        session_id = session_id or DEFAULT_SESSION
+        with self._lock:
+            depth = sum(len(queue) for queue in self._queues.values())
+            queue = self._queues.get(session_id)
+            if not queue:
+                return {"queued": 0, "depth": depth, "position": 0, "wait_time": 0.0}
+            # Sessions are served round-robin, so at most one request per session ahead of ours
+            position = list(self._queues).index(session_id) + 1
+            return {
+                "queued": len(queue),
+                "depth": depth,
+                "position": position,
+                "wait_time": time.monotonic() - queue[0].enqueued,
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "sessions_waiting": len(self._queues),
+                "admitted": self.admitted,
+                "average_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            }
+
+
+# Global instance
+llm_rate_limiter = LLMRateLimiter(
+    requests_per_second=config.LLM_RATE_LIMIT_RPS,
+    burst=config.LLM_RATE_LIMIT_BURST,
+    tokens_per_minute=config.LLM_RATE_LIMIT_TPM,
+    max_concurrency=config.LLM_MAX_CONCURRENT_REQUESTS,
+)
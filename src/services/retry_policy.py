@@ -0,0 +1,77 @@
+# services/retry_policy.py
+import asyncio
+import email.utils
+import random
+import time
+from typing import Awaitable, Callable, Optional
+import httpx
+import openai
+
+# Status codes worth retrying (same set the OpenAI SDK retries by itself)
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient LLM errors. A server-provided
+    Retry-After (or retry-after-ms) header takes precedence over the computed delay.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 max_retry_after: float = 30.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def is_retryable(self, error: BaseException) -> bool:
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+        return isinstance(error, (openai.APIConnectionError, httpx.TransportError, ConnectionError, TimeoutError,
+                                  asyncio.TimeoutError))
+
+    def retry_after(self, error: BaseException) -> Optional[float]:
+        """Seconds the server asked us to wait, if it said so."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            value = headers.get("retry-after")
+            if not value:
+                return None
+            try:
+                return float(value)
+            except ValueError:
+                retry_at = email.utils.parsedate_to_datetime(value)
+                return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        """Delay before retry number attempt (1-based)."""
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def should_retry(self, attempt: int, error: BaseException) -> bool:
+        """Whether a failed attempt (1-based) may be followed by another one."""
+        return attempt < self.max_attempts and self.is_retryable(error)
+
+    async def run(self, operation: Callable[[], Awaitable], on_retry: Callable[[int, BaseException, float], None] = None):
+        """Awaits operation(), retrying transient failures. on_retry(attempt, error, delay) is called before each wait."""
+        attempt = 1
+        while True:
+            try:
+                return await operation()
+            except Exception as e:
+                if not self.should_retry(attempt, e):
+                    raise
+                delay = self.delay(attempt, e)
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
@@ -0,0 +1,131 @@
+# services/scenario_orchestrator.py
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, List
+import src.config as config
+from src.llm_client import LLMClient
+from src.services.info_extractors import run_extractors
+from src.state.scenario_state import ScenarioState
+from src.utils.llm_logging import logger
+
+
+@dataclass
+class LLMCall:
+    """An independent LLM sub-request with its own deadline and fallback value."""
+    name: str
+    awaitable: Awaitable
+    timeout: float
+    default: Any = None
+
+
+@dataclass
+class ScenarioTurnResult:
+    """Outcome of the LLM work for one scenario turn."""
+    response: str
+    extracted_info: Dict[str, Any] = field(default_factory=dict)
+
+
+async def run_concurrently(calls: List[LLMCall]) -> Dict[str, Any]:
+    """
+    Runs independent LLM calls with asyncio.gather, each bounded by its own timeout.
+    A call that times out or fails yields its default instead of failing the others.
+    """
+    async def run_one(call: LLMCall):
+        try:
+            return await asyncio.wait_for(call.awaitable, timeout=call.timeout)
+        except asyncio.TimeoutError:
+            logger.warning("LLM call '%s' timed out after %ss", call.name, call.timeout)
+            return call.default
+        except Exception as e:
+            logger.warning("LLM call '%s' failed: %s", call.name, e)
+            return call.default
+
+    results = await asyncio.gather(*(run_one(call) for call in calls))
+    return {call.name: result for call, result in zip(calls, results)}
+
+
+class ScenarioOrchestrator:
+    """Runs the LLM work for an interactive scenario turn and merges the results into ScenarioState."""
+
+    def __init__(self, llm_client: LLMClient):
+        self.llm_client = llm_client
+
+    async def run_turn(self, scenario_state: ScenarioState, user_input: str) -> ScenarioTurnResult:
+        """
+        Evaluates the current goal for the user's latest message (already in the chat history).
+        Uses the combined single-call evaluation when the goal extracts information and falls
+        back to running extraction and goal evaluation concurrently only if its answer doesn't parse.
+        """
+        current_goal_data = scenario_state.get_current_goal()
+        current_goal = current_goal_data.get("title", "")
+        goal_prompt = current_goal_data.get("chatbot_message", "")
+        extract_info = current_goal_data.get("extract_info", {})
+
+        # Fields the goal's local extractors can read need no LLM; only the rest go in the prompt
+        local_info = {}
+        if extract_info and current_goal_data.get("extractors"):
+            found = run_extractors(user_input, extract_info, current_goal_data["extractors"])
+            local_info = {key: value for key, value in found.items() if value is not None}
+            extract_info = {key: description for key, description in extract_info.items() if key not in local_info}
+
+        if extract_info:
+            # One round trip for both the verdict and the remaining fields. Only an unparsable
+            # answer falls through to the two-call path; a timeout or API error ends the turn here
+            turn_history = scenario_state.get_context_history("turn_evaluation")
+            timeout = config.LLM_CALL_TIMEOUTS["turn_evaluation"]
+            try:
+                turn = await asyncio.wait_for(
+                    self.llm_client.evaluate_turn_async(turn_history, current_goal, extract_info),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning("LLM call 'turn' timed out after %ss", timeout)
+                timeout_message = config.get_text("api_timeout_scenario", "The AI service took too long to answer. Please try again.")
+                return ScenarioTurnResult(f"GOAL_ACHIEVED: false\n{timeout_message}", scenario_state.merge_extracted_info(local_info))
+            except Exception as e:
+                logger.warning("LLM call 'turn' failed: %s", e)
+                error_message = config.get_text("api_error_scenario", "There was an error contacting the AI service.")
+                return ScenarioTurnResult(f"GOAL_ACHIEVED: false\n{error_message}", scenario_state.merge_extracted_info(local_info))
+            if turn is not None:
+                extracted_info = scenario_state.merge_extracted_info({**turn.extracted_info, **local_info})
+                return ScenarioTurnResult(f"GOAL_ACHIEVED: {'true' if turn.goal_achieved else 'false'}", extracted_info)
+
+        # The combined call wasn't used or its answer didn't parse: the extraction and the goal
+        # evaluation are independent, so run them side by side
+        goal_history = scenario_state.get_context_history("goal_evaluation")
+        timeout_message = config.get_text("api_timeout_scenario", "The AI service took too long to answer. Please try again.")
+        calls = [
+            LLMCall(
+                "goal_response",
+                self._read_goal_verdict(goal_history, current_goal, goal_prompt),
+                timeout=config.LLM_CALL_TIMEOUTS["goal_evaluation"],
+                default=f"GOAL_ACHIEVED: false\n{timeout_message}"
+            )
+        ]
+        if extract_info:
+            calls.append(
+                LLMCall(
+                    "extracted_info",
+                    self.llm_client.extract_information_async(user_input, extract_info),
+                    timeout=config.LLM_CALL_TIMEOUTS["extract_information"],
+                    default={}
+                )
+            )
+        results = await run_concurrently(calls)
+
+        extracted_info = scenario_state.merge_extracted_info({**(results.get("extracted_info") or {}), **local_info})
+        return ScenarioTurnResult(results["goal_response"], extracted_info)
+
+    async def _read_goal_verdict(self, history, current_goal: str, goal_prompt: str) -> str:
+        """Streams the goal evaluation and stops as soon as the GOAL_ACHIEVED line is complete."""
+        full_response = ""
+        stream = self.llm_client.stream_goal_evaluation(history, current_goal, goal_prompt)
+        try:
+            async for chunk in stream:
+                full_response += chunk
+                first_line, newline, _ = full_response.partition("\n")
+                if newline and "GOAL_ACHIEVED:" in first_line:
+                    break
+        finally:
+            await stream.aclose()
+        return full_response
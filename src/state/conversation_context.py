@@ -0,0 +1,93 @@
+# state/conversation_context.py
+from typing import Dict, List
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate (~4 characters per token), good enough for budgeting prompts."""
+    return (len(text) + 3) // 4
+
+
+def estimate_message_tokens(message: Dict[str, str]) -> int:
+    # A few tokens of per-message overhead for the role and separators
+    return estimate_tokens(message.get("content", "")) + 4
+
+
+class ConversationContext:
+    """
+    Bounded view of a scenario conversation: the most recent messages verbatim plus a
+    compact running summary of older ones, kept within a token budget per call.
+    """
+
+    def __init__(self, recent_messages: int = 6, summary_max_tokens: int = 150, summary_line_chars: int = 80):
+        self.recent_messages = recent_messages
+        self.summary_max_tokens = summary_max_tokens
+        self.summary_line_chars = summary_line_chars
+        self.reset()
+
+    def reset(self):
+        """Forgets the running summary, e.g. when the scenario restarts."""
+        self._summary_lines: List[str] = []
+        self._summarized_count = 0
+        self._omitted_count = 0
+
+    def build_history(self, history: List[Dict[str, str]], token_budget: int) -> List[Dict[str, str]]:
+        """
+        Returns the messages to send instead of the full history: a summary message for older
+        turns followed by the most recent messages, trimmed to fit token_budget. The latest
+        message is always kept.
+
+        Only leaving the recent_messages window moves a message into the running summary; trimming
+        for token_budget is per call, so a small budget doesn't shrink later calls with larger ones.
+        """
+        if len(history) < self._summarized_count:
+            # The history was replaced (scenario restarted)
+            self.reset()
+
+        # Messages already folded into the summary are not repeated verbatim
+        recent_start = max(0, len(history) - self.recent_messages, self._summarized_count)
+        self._summarize_until(history, recent_start)
+        recent = list(history[recent_start:])
+
+        # Summarize the oldest verbatim messages for this call only until the budget fits
+        trimmed = []
+        while len(recent) > 1 and self._estimate(recent) > token_budget:
+            trimmed.append(recent.pop(0))
+
+        summary = self._summary_message(trimmed)
+        if summary and estimate_message_tokens(summary) + self._estimate(recent) <= token_budget:
+            return [summary] + recent
+        return recent
+
+    def _estimate(self, messages: List[Dict[str, str]]) -> int:
+        return sum(estimate_message_tokens(message) for message in messages)
+
+    def _summary_line(self, message: Dict[str, str]) -> str:
+        content = " ".join(message.get("content", "").split())
+        if len(content) > self.summary_line_chars:
+            content = content[:self.summary_line_chars].rstrip() + "..."
+        return f"{message.get('role', 'user')}: {content}"
+
+    def _bound(self, lines: List[str]) -> int:
+        """Drops the oldest lines until the summary fits summary_max_tokens; returns how many went."""
+        dropped = 0
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_max_tokens:
+            lines.pop(0)
+            dropped += 1
+        return dropped
+
+    def _summarize_until(self, history: List[Dict[str, str]], end: int):
+        """Folds history[_summarized_count:end] into the running summary (each message only once)."""
+        for message in history[self._summarized_count:end]:
+            self._summary_lines.append(self._summary_line(message))
+        self._summarized_count = max(self._summarized_count, end)
+        self._omitted_count += self._bound(self._summary_lines)
+
+    def _summary_message(self, extra_messages: List[Dict[str, str]] = ()):
+        """Running summary plus lines for extra_messages (trimmed for this call only)."""
+        lines = self._summary_lines + [self._summary_line(message) for message in extra_messages]
+        if not lines:
+            return None
+        omitted = self._omitted_count + self._bound(lines)
+        if omitted:
+            lines.insert(0, f"({omitted} earlier messages omitted)")
+        return {"role": "system", "content": "Summary of the earlier conversation:\n" + "\n".join(lines)}
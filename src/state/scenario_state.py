@@ -1,4 +1,6 @@
 # state/scenario_state.py
+import src.config as config
+from src.state.conversation_context import ConversationContext
 
 class ScenarioState:
     def __init__(self):
@@ -7,6 +9,10 @@ class ScenarioState:
         self.scenario_current_goal_index = 0
         self.scenario_extracted_info = {}
         self.scenario_chat_history = []
+        self.context = ConversationContext(
+            recent_messages=config.CONTEXT_RECENT_MESSAGES,
+            summary_max_tokens=config.CONTEXT_SUMMARY_MAX_TOKENS
+        )
 
     def reset(self, user_data_handler=None):
         """Resets the current scenario state to initial values."""
@@ -18,6 +24,25 @@ class ScenarioState:
         self.scenario_current_goal_index = 0
         self.scenario_extracted_info = {}
         self.scenario_chat_history = []
+        self.context.reset()
+
+    def get_context_history(self, call_type: str) -> list:
+        """Returns the chat history bounded to the token budget configured for call_type."""
+        budget = config.CONTEXT_TOKEN_BUDGETS.get(call_type, config.CONTEXT_TOKEN_BUDGETS["default"])
+        return self.context.build_history(self.scenario_chat_history, budget)
+
+    def get_current_goal(self) -> dict:
+        """Returns the definition of the goal currently being worked on, or {} when all are done."""
+        if self.scenario_current_goal_index < len(self.scenario_user_goals):
+            return self.scenario_user_goals[self.scenario_current_goal_index]
+        return {}
+
+    def merge_extracted_info(self, extracted_info: dict) -> dict:
+        """Merges information extracted during a turn and returns what was merged."""
+        if not extracted_info:
+            return {}
+        self.scenario_extracted_info.update(extracted_info)
+        return extracted_info
 
     def get_all_available_variables(self, global_user_data):
         """Returns all available variables from both global user data and current scenario."""
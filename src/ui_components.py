@@ -33,19 +33,31 @@ class LoadingMessage(ft.Row):
     def __init__(self):
         super().__init__()
         self.vertical_alignment = ft.CrossAxisAlignment.START
+        self.status_text = ft.Text("", size=12, italic=True, color=ft.Colors.GREY_600, visible=False)
         self.controls = [
             ft.CircleAvatar(
                 content=ft.Image(src="assets/logo.svg", width=24, height=24, fit=ft.ImageFit.CONTAIN),
                 bgcolor=ft.Colors.TEAL_200,
             ),
             ft.Container(
-                content=ft.ProgressRing(width=20, height=20, stroke_width=2),
+                content=ft.Row(
+                    [
+                        ft.ProgressRing(width=20, height=20, stroke_width=2),
+                        self.status_text,
+                    ],
+                    tight=True,
+                ),
                 padding=10,
                 border_radius=10,
                 bgcolor=ft.Colors.with_opacity(0.05, ft.Colors.BLACK),
             ),
         ]
 
+    def set_status(self, text: str):
+        """Muestra (o con texto vacío oculta) un estado junto al indicador, p. ej. la posición en la cola."""
+        self.status_text.value = text
+        self.status_text.visible = bool(text)
+
 # --- Componentes de Diapositivas ---
 
 class BaseSlide(ft.Column):
@@ -259,13 +271,15 @@ class LLMCheckSlide(ft.Column):
         self.prompt_text = ft.Text(slide_data['chatbot_message'], size=20, text_align=ft.TextAlign.CENTER)
         self.answer_field = ft.TextField(label=config.get_text("your_answer", "Your answer..."), width=300, text_align=ft.TextAlign.CENTER)
         self.check_button = ft.ElevatedButton(config.get_text("check_with_ai", "Check with AI"))
+        # Visible only while the AI is grading
+        self.cancel_button = ft.TextButton(config.get_text("cancel", "Cancel"), visible=False)
         self.result_text = ft.Text(value="", size=16, text_align=ft.TextAlign.CENTER, italic=True)
         
         super().__init__(
             controls=[
                 self.prompt_text,
                 self.answer_field,
-                self.check_button,
+                ft.Row([self.check_button, self.cancel_button], alignment=ft.MainAxisAlignment.CENTER, tight=True),
                 ft.Container(self.result_text, padding=10)
             ],
             alignment=ft.MainAxisAlignment.CENTER,
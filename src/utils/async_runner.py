@@ -0,0 +1,104 @@
+"""
+Dedicated background event loop for long-lived async I/O (LLM calls).
+
+Flet runs sync handlers on worker threads and async handlers on its own loop,
+while async HTTP connection pools are bound to the loop that created them.
+Running all LLM coroutines on one process-wide loop lets every session share
+the same keep-alive pool regardless of where the call originates.
+"""
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, AsyncIterator, Coroutine, Optional
+
+
+class AsyncRunner:
+    """Runs coroutines on a private event loop living in a daemon thread."""
+
+    def __init__(self, name: str = "async-runner"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Returns the runner loop, starting the background thread on first use."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    ready = threading.Event()
+
+                    def run():
+                        asyncio.set_event_loop(loop)
+                        loop.call_soon(ready.set)
+                        loop.run_forever()
+
+                    self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                    self._thread.start()
+                    ready.wait()
+                    self._loop = loop
+        return self._loop
+
+    def is_runner_thread(self) -> bool:
+        """True when called from inside the runner loop's thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedules a coroutine on the runner loop and returns a thread-safe future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Blocks the calling thread until the coroutine finishes on the runner loop."""
+        if self.is_runner_thread():
+            coro.close()
+            raise RuntimeError("AsyncRunner.run() cannot be called from the runner loop itself")
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro: Coroutine) -> Any:
+        """Awaits a coroutine on the runner loop from any other event loop.
+
+        Cancelling the awaiting task also cancels the coroutine on the runner loop.
+        """
+        if self.is_runner_thread():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    async def iterate_async(self, agen: AsyncIterator) -> AsyncIterator:
+        """Consumes an async generator on the runner loop, yielding its items in the caller's loop."""
+        if self.is_runner_thread():
+            async for item in agen:
+                yield item
+            return
+
+        caller_loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    caller_loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except Exception as e:
+                caller_loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+            else:
+                caller_loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+            finally:
+                await agen.aclose()
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+
+# Shared loop for all LLM traffic in the process
+llm_runner = AsyncRunner("llm-io")
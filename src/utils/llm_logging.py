@@ -0,0 +1,72 @@
+"""
+Logging for LLM traffic.
+
+Replaces console dumps of full prompts with a `logging` logger. Requests and responses are
+logged at DEBUG level, sampled by LLM_LOG_SAMPLE_RATE, and summarized by a prompt hash and
+sizes unless LLM_LOG_PROMPTS is enabled. Messages are formatted lazily, so nothing is
+serialized when the level is disabled.
+"""
+import hashlib
+import logging
+import random
+from typing import Dict, List
+import src.config as config
+
+logger = logging.getLogger("elearn.llm")
+
+
+def configure_logging():
+    """Attaches a console handler and applies config.LLM_LOG_LEVEL. Safe to call more than once."""
+    logger.setLevel(getattr(logging, str(config.LLM_LOG_LEVEL).upper(), logging.INFO))
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+
+def prompt_hash(text: str) -> str:
+    """Short stable identifier of a prompt, for correlating log lines without the prompt body."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+class _MessagesSummary:
+    """Formats a message list only when the log record is actually emitted."""
+
+    def __init__(self, messages: List[Dict[str, str]]):
+        self.messages = messages
+
+    def __str__(self):
+        if config.LLM_LOG_PROMPTS:
+            return "\n" + "\n".join(
+                f"{i + 1}. {msg['role'].upper()}: {msg['content']}" for i, msg in enumerate(self.messages)
+            )
+        system = "".join(msg["content"] for msg in self.messages if msg["role"] == "system")
+        chars = sum(len(msg["content"]) for msg in self.messages)
+        return f"system={prompt_hash(system)} messages={len(self.messages)} chars={chars}"
+
+
+class _TextSummary:
+    def __init__(self, text: str):
+        self.text = text or ""
+
+    def __str__(self):
+        if config.LLM_LOG_PROMPTS:
+            return "\n" + self.text
+        return f"hash={prompt_hash(self.text)} chars={len(self.text)}"
+
+
+def _sampled() -> bool:
+    return logger.isEnabledFor(logging.DEBUG) and random.random() < config.LLM_LOG_SAMPLE_RATE
+
+
+def log_request(kind: str, messages: List[Dict[str, str]]):
+    """Logs an outgoing request at DEBUG level (sampled)."""
+    if _sampled():
+        logger.debug("%s request: %s", kind, _MessagesSummary(messages))
+
+
+def log_response(kind: str, text: str):
+    """Logs a response at DEBUG level (sampled)."""
+    if _sampled():
+        logger.debug("%s response: %s", kind, _TextSummary(text))
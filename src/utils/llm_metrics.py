@@ -0,0 +1,207 @@
+"""
+Metrics for LLM calls.
+
+Records, per (method, backend): a latency histogram, time to first token for streamed
+calls, prompt/completion tokens from `response.usage`, retries and errors by class.
+`llm_metrics.snapshot()` returns everything as a dict; `start_periodic_export()` writes
+it to a JSONL file or a Prometheus text file in the background.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from src.utils.llm_logging import logger
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing the q-quantile (None without observations)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        cumulative, seen = {}, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            cumulative[str(bound)] = seen
+        cumulative["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": cumulative,
+        }
+
+
+class _CallStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.ttft = Histogram()
+        self.requests = 0
+        self.errors: Dict[str, int] = {}
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "error_rate": sum(self.errors.values()) / self.requests if self.requests else 0.0,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency": self.latency.snapshot(),
+            "ttft": self.ttft.snapshot(),
+        }
+
+
+class LLMMetrics:
+    """Thread-safe registry of per-(method, backend) call statistics."""
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], _CallStats] = {}
+        self._lock = threading.Lock()
+        self._exporter: Optional[threading.Thread] = None
+        self._stop_export = threading.Event()
+
+    def _get(self, method: str, backend: str) -> _CallStats:
+        stats = self._stats.get((method, backend))
+        if stats is None:
+            stats = self._stats[(method, backend)] = _CallStats()
+        return stats
+
+    def record_success(self, method: str, backend: str, latency: float):
+        with self._lock:
+            stats = self._get(method, backend)
+            stats.requests += 1
+            stats.latency.observe(latency)
+
+    def record_error(self, method: str, backend: str, latency: float, error: BaseException):
+        with self._lock:
+            stats = self._get(method, backend)
+            stats.requests += 1
+            stats.latency.observe(latency)
+            name = type(error).__name__
+            stats.errors[name] = stats.errors.get(name, 0) + 1
+
+    def record_first_token(self, method: str, backend: str, elapsed: float):
+        with self._lock:
+            self._get(method, backend).ttft.observe(elapsed)
+
+    def record_usage(self, method: str, backend: str, usage):
+        """Adds token counts from an OpenAI `usage` object (ignored when missing)."""
+        if usage is None:
+            return
+        with self._lock:
+            stats = self._get(method, backend)
+            stats.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            stats.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+    def record_retry(self, method: str, backend: str):
+        with self._lock:
+            self._get(method, backend).retries += 1
+
+    def snapshot(self) -> dict:
+        """Returns {method: {backend: stats}}."""
+        with self._lock:
+            result: Dict[str, dict] = {}
+            for (method, backend), stats in sorted(self._stats.items()):
+                result.setdefault(method, {})[backend] = stats.snapshot()
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    # --- Export ---
+
+    def export_jsonl(self, path: str):
+        """Appends one JSON line with a timestamped snapshot."""
+        line = json.dumps({"timestamp": time.time(), "metrics": self.snapshot()})
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def export_prometheus(self, path: str):
+        """Writes the current values in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            items = sorted(self._stats.items())
+            for (method, backend), stats in items:
+                labels = f'method="{method}",backend="{backend}"'
+                lines.append(f"llm_requests_total{{{labels}}} {stats.requests}")
+                lines.append(f"llm_retries_total{{{labels}}} {stats.retries}")
+                lines.append(f"llm_prompt_tokens_total{{{labels}}} {stats.prompt_tokens}")
+                lines.append(f"llm_completion_tokens_total{{{labels}}} {stats.completion_tokens}")
+                for error, count in sorted(stats.errors.items()):
+                    lines.append(f'llm_errors_total{{{labels},error="{error}"}} {count}')
+                for metric, histogram in (("llm_latency_seconds", stats.latency), ("llm_ttft_seconds", stats.ttft)):
+                    seen = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        seen += count
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {seen}')
+                    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        # Replace the file in one step so scrapers never read a half-written file
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
+
+    def export(self, path: str):
+        """Exports in Prometheus text format for .prom/.txt paths, JSONL otherwise."""
+        if path.endswith((".prom", ".txt")):
+            self.export_prometheus(path)
+        else:
+            self.export_jsonl(path)
+
+    def start_periodic_export(self, path: str, interval: float = 60.0):
+        """Exports every interval seconds from a daemon thread (once per process)."""
+        if self._exporter is not None:
+            return
+
+        def run():
+            while not self._stop_export.wait(interval):
+                try:
+                    self.export(path)
+                except Exception as e:
+                    logger.warning("LLM metrics export failed: %s", e)
+
+        self._exporter = threading.Thread(target=run, name="llm-metrics-export", daemon=True)
+        self._exporter.start()
+
+    def stop_periodic_export(self):
+        self._stop_export.set()
+
+
+# Process-wide metrics shared by every LLMClient
+llm_metrics = LLMMetrics()
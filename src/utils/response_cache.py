@@ -0,0 +1,261 @@
+"""
+Two-tier cache for deterministic LLM responses.
+
+An in-memory LRU tier answers repeated requests instantly; an optional SQLite
+tier keeps responses across restarts with TTL and size-based eviction.
+
+The disk tier never runs on the caller's event loop: writes (and the `accessed`
+timestamps of disk hits) are queued to a background writer thread that commits them
+in batches, and `get_async` reads disk rows from a worker thread.
+"""
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Optional
+
+# The LLM-side logger of src/utils/llm_logging.py, by name: that module imports config
+logger = logging.getLogger("elearn.llm")
+
+
+class ResponseCache:
+    """LRU response cache with an optional on-disk tier and hit/miss counters."""
+
+    # Writes committed per transaction by the background writer
+    WRITE_BATCH_SIZE = 100
+    # Writes between two prunes of the disk tier
+    PRUNE_EVERY = 50
+
+    def __init__(self, max_entries: int = 256, db_path: Optional[str] = None,
+                 ttl: float = 7 * 24 * 3600, max_db_entries: int = 5000):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_db_entries = max_db_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._read_db = None
+        self._read_lock = threading.Lock()
+        self._db_failed = False
+        self._writes: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writes_since_prune = 0
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+
+    @staticmethod
+    def normalize_input(text: str) -> str:
+        """Normalizes user input so trivially different answers share a cache entry."""
+        text = unicodedata.normalize("NFKC", text or "").casefold()
+        text = re.sub(r"\s+", " ", text).strip()
+        return text.strip(" .!?¡¿,;:")
+
+    @classmethod
+    def make_key(cls, method: str, model: str, system_prompt: str, user_input: str) -> str:
+        """Builds a cache key from (method, model, system prompt hash, normalized user input)."""
+        prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        raw = json.dumps([method, model, prompt_hash, cls.normalize_input(user_input)], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for key, or None on a miss. Reads the disk tier inline, so
+        code on an event loop should use get_async."""
+        found, value = self._get_memory(key)
+        if found:
+            return value
+        return self._finish_disk_lookup(key, self._db_get(key))
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """Like get, but a disk lookup runs in a worker thread instead of blocking the loop."""
+        found, value = self._get_memory(key)
+        if found:
+            return value
+        disk_entry = await asyncio.to_thread(self._db_get, key) if self._disk_enabled() else None
+        return self._finish_disk_lookup(key, disk_entry)
+
+    def set(self, key: str, value: Any):
+        """Stores a JSON-serializable value in memory now and on disk in the background."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        if self._disk_enabled():
+            self._enqueue(("set", key, json.dumps(value, ensure_ascii=False), now))
+
+    def clear(self):
+        """Drops all cached entries and resets the counters."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.misses = self.memory_hits = self.disk_hits = 0
+        if self._disk_enabled():
+            self._enqueue(("clear",))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Waits until the queued disk writes are committed."""
+        if self._writer is not None:
+            done = threading.Event()
+            self._writes.put(("sync", done))
+            done.wait(timeout)
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_enabled": self._disk_enabled(),
+                "pending_disk_writes": self._writes.qsize(),
+            }
+
+    def _get_memory(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if time.time() - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return True, value
+                del self._memory[key]
+        return False, None
+
+    def _finish_disk_lookup(self, key: str, disk_entry) -> Optional[Any]:
+        with self._lock:
+            if disk_entry is None:
+                self.misses += 1
+                return None
+            value, created = disk_entry
+            self._remember(key, value, created)
+            self.hits += 1
+            self.disk_hits += 1
+        # LRU bookkeeping for the disk tier is batched with the writes, not committed per read
+        self._enqueue(("touch", key, time.time()))
+        return value
+
+    def _remember(self, key: str, value: Any, created: float):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_enabled(self) -> bool:
+        return bool(self.db_path) and not self._db_failed
+
+    def _connect(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL lets the reader connection work while the writer commits
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+        db.commit()
+        return db
+
+    def _db_get(self, key: str):
+        """Reads one row from the disk tier (blocking). Expired rows are left to the prune."""
+        if not self._disk_enabled():
+            return None
+        with self._read_lock:
+            try:
+                if self._read_db is None:
+                    self._read_db = self._connect()
+                row = self._read_db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            except Exception as e:
+                self._disable_disk(e)
+                return None
+        if row is None:
+            return None
+        value, created = row
+        if time.time() - created > self.ttl:
+            return None
+        return json.loads(value), created
+
+    def _disable_disk(self, error: Exception):
+        if not self._db_failed:
+            logger.warning("Response cache disk tier disabled: %s", error)
+        self._db_failed = True
+
+    def _enqueue(self, operation: tuple):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="response-cache-writer", daemon=True)
+                    self._writer.start()
+                    atexit.register(self.flush, 2.0)
+        self._writes.put(operation)
+
+    def _write_loop(self):
+        """Owns the writing connection; commits queued operations in batches."""
+        try:
+            db = self._connect()
+        except Exception as e:
+            self._disable_disk(e)
+            db = None
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            if db is not None:
+                try:
+                    self._apply(db, batch)
+                except Exception as e:
+                    logger.exception("Response cache write failed: %s", e)
+            for operation in batch:
+                if operation[0] == "sync":
+                    operation[1].set()
+
+    def _apply(self, db, batch: list):
+        writes = 0
+        with db:
+            for operation in batch:
+                kind = operation[0]
+                if kind == "set":
+                    _, key, value, now = operation
+                    db.execute(
+                        "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                        (key, value, now, now)
+                    )
+                    writes += 1
+                elif kind == "touch":
+                    _, key, now = operation
+                    db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                elif kind == "clear":
+                    db.execute("DELETE FROM responses")
+        self._writes_since_prune += writes
+        if self._writes_since_prune >= self.PRUNE_EVERY:
+            self._prune(db, time.time())
+
+    def _prune(self, db, now: float):
+        """Evicts expired rows, then the least recently used rows beyond max_db_entries."""
+        self._writes_since_prune = 0
+        with db:
+            db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_db_entries,)
+            )
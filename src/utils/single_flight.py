@@ -0,0 +1,75 @@
+"""
+Single-flight coalescing of identical in-flight requests.
+
+Concurrent callers asking for the same key await one shared task instead of
+each starting their own, so a double-click or several sessions sending the
+same prompt cost a single LLM round trip.
+"""
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Shares one running task between concurrent callers of the same key.
+
+    Not thread-safe: all calls must come from the same event loop (the llm_runner loop).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self.started = 0
+        self.deduplicated = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Fingerprints the JSON-serializable parts of a request."""
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def run(self, key: str, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the result of coro_fn(), sharing it with every caller that asks for key while
+        it is running. The shared task is cancelled only once all of its callers were cancelled.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.started += 1
+        else:
+            self.deduplicated += 1
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(key) == 1:
+                # Nobody else is waiting for the result any more
+                task.cancel()
+            raise
+        finally:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def stats(self) -> dict:
+        """Returns how many requests were started and how many joined one already in flight."""
+        total = self.started + self.deduplicated
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "deduplicated": self.deduplicated,
+            "dedup_rate": self.deduplicated / total if total else 0.0,
+        }
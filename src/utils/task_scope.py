@@ -0,0 +1,55 @@
+"""
+Ownership of cancellable background work.
+
+UI code starts its LLM work through a TaskScope owned by the slide or view that will
+consume the result, and cancels the scope when that owner goes away (navigation,
+scenario restart, slide change). Cancelling an awaited `llm_runner.run_async(...)`
+call cancels the coroutine on the runner loop as well, so an abandoned request gives
+back its connection and rate-limit slot straight away instead of finishing for nobody.
+"""
+import asyncio
+import threading
+from typing import Coroutine, Set
+
+
+class TaskScope:
+    """Tracks asyncio tasks started for one owner; cancel_all() may be called from any thread."""
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    def spawn(self, coro: Coroutine) -> asyncio.Task:
+        """Runs the coroutine as a task on the current event loop, owned by this scope."""
+        task = asyncio.get_running_loop().create_task(coro)
+        with self._lock:
+            self._tasks.add(task)
+        task.add_done_callback(self._discard)
+        return task
+
+    def _discard(self, task: asyncio.Task):
+        with self._lock:
+            self._tasks.discard(task)
+
+    def cancel_all(self):
+        """Cancels every pending task. Sync Flet handlers run on worker threads, so cancellation
+        is handed to each task's own loop."""
+        with self._lock:
+            tasks, self._tasks = self._tasks, set()
+        for task in tasks:
+            loop = task.get_loop()
+            if loop.is_closed():
+                continue
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                task.cancel()
+            else:
+                loop.call_soon_threadsafe(task.cancel)
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._tasks)
@@ -4,8 +4,14 @@ import src.config as config
 from src.app_state import AppState
 from src.llm_client import LLMClient
 import asyncio
+from src.services.answer_grader import answer_grader
+from src.services.scenario_orchestrator import ScenarioOrchestrator
 from src.ui_components import create_slide_content, ChatMessage, LoadingMessage, InteractiveScenarioSlide, LLMCheckSlide
-from src.utils.typing_simulator import simulate_typing
+from src.utils.llm_logging import logger
+from src.utils.task_scope import TaskScope
+
+# How often the loading bubble refreshes the rate limiter queue status (seconds)
+QUEUE_STATUS_INTERVAL = 0.5
 
 class LessonViewModel:
     def __init__(self, app_state: AppState, llm_client: LLMClient, page: ft.Page, view: ft.View):
@@ -13,8 +19,32 @@ class LessonViewModel:
         self.llm_client = llm_client
         self.page = page
         self.view = view
+        self.scenario_orchestrator = ScenarioOrchestrator(llm_client)
+        # LLM work started for the current slide; cancelled whenever that slide goes away
+        self.slide_tasks = TaskScope()
+
+    def cancel_pending_llm_work(self):
+        """Cancels LLM calls whose results would land on a slide that is no longer shown"""
+        self.slide_tasks.cancel_all()
+
+    async def _report_queue_status(self, loading: LoadingMessage):
+        """Shows the queue depth and wait time in the loading bubble while this session's LLM request is queued"""
+        showing = False
+        while True:
+            await asyncio.sleep(QUEUE_STATUS_INTERVAL)
+            status = self.llm_client.get_queue_status()
+            text = ""
+            if status["queued"]:
+                text = config.get_text("llm_queue_status", "Waiting in queue ({depth} requests) · {wait}s").format(
+                    depth=status["depth"], wait=int(status["wait_time"])
+                )
+            if text or showing:
+                loading.set_status(text)
+                loading.update()
+                showing = bool(text)
 
     def update_slide_content(self):
+        self.cancel_pending_llm_work()
         current_slide_data = self.app_state.lesson_state.get_current_slide_data()
         if not current_slide_data:
             return
@@ -164,41 +194,18 @@ class LessonViewModel:
             scenario_state.scenario_chat_history.append({"role": "user", "content": user_input})
 
             async def get_llm_response():
-                current_goal_index = scenario_state.scenario_current_goal_index
-                current_goal = scenario_state.scenario_user_goals[current_goal_index]["title"] if current_goal_index < len(scenario_state.scenario_user_goals) else ""
-                goal_prompt = scenario_state.scenario_user_goals[current_goal_index].get("chatbot_message", "") if current_goal_index < len(scenario_state.scenario_user_goals) else ""
-                
-                current_goal_data = scenario_state.scenario_user_goals[current_goal_index] if current_goal_index < len(scenario_state.scenario_user_goals) else {}
-                extract_info = current_goal_data.get("extract_info", {})
-                
-                if extract_info:
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        loop = asyncio.get_event_loop()
-                        extracted_data = await loop.run_in_executor(
-                            executor,
-                            self.llm_client.extract_information,
-                            user_input,
-                            extract_info
-                        )
-                        if extracted_data:
-                            scenario_state.scenario_extracted_info.update(extracted_data)
-                            self.app_state.progress_manager.save_user_data(extracted_data)
-                
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    loop = asyncio.get_event_loop()
-                    full_response = await loop.run_in_executor(
-                        executor, 
-                        self.llm_client.evaluate_goal_completion, 
-                        scenario_state.scenario_chat_history, 
-                        current_goal,
-                        goal_prompt
-                    )
-                return full_response
+                queue_status_task = asyncio.create_task(self._report_queue_status(loading))
+                try:
+                    result = await self.scenario_orchestrator.run_turn(scenario_state, user_input)
+                finally:
+                    queue_status_task.cancel()
+                if result.extracted_info:
+                    self.app_state.progress_manager.save_user_data(result.extracted_info)
+                return result.response
 
+            llm_task = self.slide_tasks.spawn(get_llm_response())
             try:
-                full_response = await get_llm_response()
+                full_response = await llm_task
                 
                 chat_response = "Hubo un error al procesar la respuesta."
                 
@@ -249,12 +256,10 @@ class LessonViewModel:
                     print(f"Error processing LLM response: {err}")
                     chat_response = "Hubo un error al procesar la respuesta."
 
+                # The reply is ready as soon as the verdict arrives; render it at once instead of replaying it
                 slide.scrollable_content.controls.remove(loading)
-                assistant_text_control = ft.Text(selectable=True)
+                assistant_text_control = ft.Text(chat_response, selectable=True)
                 slide.scrollable_content.controls.append(ChatMessage(assistant_text_control, is_user=False))
-                self.page.update()
-
-                await simulate_typing(assistant_text_control, chat_response, self.page)
 
                 scenario_state.scenario_chat_history.append({"role": "assistant", "content": chat_response})
                 
@@ -264,6 +269,9 @@ class LessonViewModel:
 
                 self.page.update()
                 
+            except asyncio.CancelledError:
+                # The learner left the slide or restarted the scenario; its state and controls are stale
+                return
             except Exception as e:
                 if loading in slide.scrollable_content.controls:
                     slide.scrollable_content.controls.remove(loading)
@@ -276,6 +284,7 @@ class LessonViewModel:
         slide.new_message.on_submit = send_message_click
 
         def restart_scenario_click(e):
+            self.cancel_pending_llm_work()
             scenario_state.reset(self.app_state.progress_manager.save_user_data)
             self.app_state.progress_manager.clear_interactive_scenario_progress(lesson_id, scenario_id)
             
@@ -312,19 +321,12 @@ class LessonViewModel:
         slide.restart_button.on_click = restart_scenario_click
 
     def handle_llm_check(self, slide: LLMCheckSlide, slide_data: dict):
-        def check_answer_click(e):
-            user_input = slide.answer_field.value
-            if not user_input:
-                return
-            
-            slide.check_button.disabled = True
-            slide.result_text.value = "Pensando..."
-            self.page.update()
+        pending_check = None
 
-            correction = self.llm_client.get_correction(user_input, slide_data["chatbot_message"])
-            
-            slide.result_text.value = correction
+        def finish_check(result: str):
+            slide.result_text.value = result
             slide.check_button.disabled = False
+            slide.cancel_button.visible = False
             
             lesson_content = self.app_state.data_manager.get_lesson_content(self.app_state.lesson_state.current_lesson_id)
             is_last_slide = self.app_state.lesson_state.current_slide_index == len(lesson_content) - 1
@@ -333,9 +335,64 @@ class LessonViewModel:
             
             self.page.update()
 
+        async def stream_correction(user_input: str):
+            # Shows the correction as it is generated
+            correction = ""
+            async for chunk in self.llm_client.stream_correction(user_input, slide_data["chatbot_message"]):
+                correction += chunk
+                slide.result_text.value = correction
+                self.page.update()
+            return correction
+
+        async def check_answer_click(e):
+            nonlocal pending_check
+            user_input = slide.answer_field.value
+            if not user_input or slide.check_button.disabled:
+                return
+            
+            # Clear-cut answers are graded locally; only ambiguous ones need the LLM
+            grade = answer_grader.grade(user_input, slide_data.get("expected_answers"))
+            if grade.is_decisive:
+                finish_check(grade.feedback)
+                return
+
+            slide.check_button.disabled = True
+            slide.cancel_button.visible = True
+            slide.result_text.value = "Pensando..."
+            self.page.update()
+
+            check_task = pending_check = self.slide_tasks.spawn(
+                asyncio.wait_for(stream_correction(user_input), config.LLM_CALL_TIMEOUTS["correction"])
+            )
+            try:
+                correction = await check_task
+            except asyncio.CancelledError:
+                # Cancelled by the learner (the UI is already reset) or the slide is gone
+                return
+            except asyncio.TimeoutError:
+                correction = config.get_text("api_timeout_check", "The AI service took too long to answer. Please try again.")
+            except Exception as err:
+                logger.warning("Error checking answer: %s", err)
+                correction = config.get_text("api_error", "There was an error contacting the AI service.")
+            finally:
+                if pending_check is check_task:
+                    pending_check = None
+            finish_check(correction)
+
+        async def cancel_check_click(e):
+            if pending_check is None:
+                return
+            pending_check.cancel()
+            slide.result_text.value = ""
+            slide.check_button.disabled = False
+            slide.cancel_button.visible = False
+            self.page.update()
+
         slide.check_button.on_click = check_answer_click
+        slide.cancel_button.on_click = cancel_check_click
 
     def go_back_to_home(self, e):
+        self.cancel_pending_llm_work()
         self.app_state.lesson_state.save_current_slide_position()
         self.page.go('/')
 
@@ -350,5 +407,6 @@ class LessonViewModel:
         if self.app_state.lesson_state.next_slide():
             self.update_slide_content()
         else:
+            self.cancel_pending_llm_work()
             self.app_state.progress_manager.mark_lesson_completed(self.app_state.lesson_state.current_lesson_id)
             self.page.go('/')
\ No newline at end of file
@@ -54,6 +54,10 @@ class LessonView(ft.View):
         
         self.view_model.update_slide_content()
 
+    def dispose(self):
+        """Called when the view is torn down; cancels LLM calls still pending for its slide"""
+        self.view_model.cancel_pending_llm_work()
+
     def go_back_to_home(self, e):
         self.view_model.go_back_to_home(e)
 
@@ -19,6 +19,20 @@ def create_api_status_indicator(llm_client):
             "bgcolor": ft.Colors.GREEN_50,
             "border_color": ft.Colors.GREEN_200,
         },
+        "validating": {
+            "icon": ft.Icons.HOURGLASS_TOP,
+            "text": "Validating API Key...",
+            "color": ft.Colors.BLUE,
+            "bgcolor": ft.Colors.BLUE_50,
+            "border_color": ft.Colors.BLUE_200,
+        },
+        "local": {
+            "icon": ft.Icons.COMPUTER,
+            "text": "Local Model Active",
+            "color": ft.Colors.GREEN,
+            "bgcolor": ft.Colors.GREEN_50,
+            "border_color": ft.Colors.GREEN_200,
+        },
         "fallback": {
             "icon": ft.Icons.WARNING,
             "text": "Using Gradio Fallback",
@@ -37,6 +51,10 @@ def create_api_status_indicator(llm_client):
 
     if llm_client.is_deepseek_active():
         status = "active"
+    elif getattr(llm_client, 'validation_pending', False):
+        status = "validating"
+    elif getattr(llm_client, 'local_client', None) is not None:
+        status = "local"
     elif getattr(llm_client, 'active', False) and not getattr(llm_client, 'using_deepseek', False):
         status = "fallback"
     else:
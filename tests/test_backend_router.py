@@ -0,0 +1,65 @@
+"""Circuit breaking and recovery in BackendRouter."""
+import time
+
+from src.services.backend_router import BackendRouter
+
+
+def make_router():
+    router = BackendRouter(failure_threshold=3, open_seconds=0.1, min_samples=5)
+    for _ in range(5):
+        router.record_success("fast", 0.10)
+        router.record_success("slow", 0.12)
+    return router
+
+
+def fail(router, name, times, latency=10.0):
+    for _ in range(times):
+        assert router.acquire(name)
+        router.record_failure(name, latency, TimeoutError())
+
+
+def test_open_circuit_is_skipped_until_its_cooldown():
+    router = make_router()
+    fail(router, "fast", 3)
+
+    assert router.route(["fast", "slow"]) == ["slow"]
+    assert not router.acquire("fast")
+
+
+def test_recovering_backend_is_probed_first_after_the_cooldown():
+    router = make_router()
+    fail(router, "fast", 3)
+    time.sleep(0.15)
+
+    # Its outage samples alone would rank it behind the slower backend
+    assert router.route(["fast", "slow"]) == ["fast", "slow"]
+    assert router.acquire("fast")
+    # Only one probe at a time; other requests go elsewhere meanwhile
+    assert not router.acquire("fast")
+    assert router.route(["fast", "slow"]) == ["slow"]
+
+
+def test_successful_probe_restores_the_preferred_order():
+    router = make_router()
+    fail(router, "fast", 3)
+    time.sleep(0.15)
+
+    assert router.acquire("fast")
+    router.record_success("fast", 0.10)
+
+    assert router.snapshot()["fast"]["state"] == "closed"
+    assert router.route(["fast", "slow"]) == ["fast", "slow"]
+    for _ in range(5):
+        router.record_success("fast", 0.10)
+    assert router.route(["fast", "slow"]) == ["fast", "slow"]
+
+
+def test_failed_probe_reopens_the_circuit():
+    router = make_router()
+    fail(router, "fast", 3)
+    time.sleep(0.15)
+
+    fail(router, "fast", 1)
+
+    assert router.snapshot()["fast"]["state"] == "open"
+    assert router.route(["fast", "slow"]) == ["slow"]
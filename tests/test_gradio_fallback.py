@@ -0,0 +1,57 @@
+"""LLMClient's Gradio fallback against benchmarks/mock_llm_server.py, offline."""
+import asyncio
+import os
+import sys
+
+import pytest
+
+import src.llm_client as llm_client
+from src.llm_client import LLMClient
+from src.services.backend_router import BackendRouter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import mock_llm_server  # noqa: E402
+
+pytest.importorskip("gradio_client")
+
+HISTORY = [{"role": "user", "content": "Hallo, ik ben Ana."}]
+
+
+@pytest.fixture
+def mock_url():
+    server, url = mock_llm_server.start_in_background(["--api-key", "sk-mock", "--latency", "fixed:0", "--token-delay", "0"])
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(monkeypatch, mock_url):
+    monkeypatch.setattr(llm_client.config, "BASE_URL", mock_url)
+    monkeypatch.setattr(llm_client.config, "GRADIO_SPACE", mock_url)
+    monkeypatch.setattr(llm_client.config, "LOCAL_LLM_BASE_URL", None)
+    monkeypatch.setattr(llm_client.config, "get_effective_api_key", lambda: "sk-rejected")
+    monkeypatch.setattr(llm_client, "backend_router", BackendRouter())
+    monkeypatch.setattr(llm_client, "_validation_cache", {})
+    monkeypatch.setattr(llm_client, "_gradio_client", None)
+
+    client = LLMClient()
+    client._apply_validation("sk-rejected", client.validate_api_key())
+    return client
+
+
+def test_rejected_key_falls_back_to_the_mock_gradio_space(client):
+    assert client.get_api_status()["using_gradio"]
+    assert llm_client._get_gradio_client() is not None
+
+    assert client.evaluate_goal_completion(HISTORY, "Introduce yourself").startswith("GOAL_ACHIEVED: ")
+    assert llm_client.backend_router.snapshot()["gradio"]["total_requests"] == 1
+
+
+def test_gradio_fallback_streams_from_the_mock(client):
+    async def consume():
+        return [delta async for delta in client.stream_goal_evaluation(HISTORY, "Introduce yourself")]
+
+    deltas = asyncio.run(consume())
+    assert "".join(deltas).startswith("GOAL_ACHIEVED: ")
+    assert llm_client.backend_router.snapshot()["gradio"]["total_failures"] == 0
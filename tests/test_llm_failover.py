@@ -0,0 +1,99 @@
+"""Failover between LLM backends and what it leaves behind in the response cache."""
+import asyncio
+import time
+
+import pytest
+
+import src.llm_client as llm_client
+from src.llm_client import BACKEND_GRADIO, BACKEND_OPENAI, LLMClient
+from src.services.backend_router import BackendRouter
+from src.services.retry_policy import RetryPolicy
+from src.utils.response_cache import ResponseCache
+from src.utils.single_flight import SingleFlight
+
+QUESTION = "How do you say hello?"
+
+
+class FakeBackends:
+    """Stands in for _complete_on/_stream_on: every backend answers with its own name unless it is down."""
+
+    def __init__(self):
+        self.down = set()
+        self.calls = []
+
+    def _answer(self, backend):
+        self.calls.append(backend)
+        if backend in self.down:
+            raise RuntimeError(f"{backend} is down")
+        return f"answer from {backend}"
+
+    async def complete_on(self, backend, messages, profile):
+        return self._answer(backend)
+
+    async def stream_on(self, backend, messages, profile):
+        yield self._answer(backend)
+
+
+@pytest.fixture
+def backends():
+    return FakeBackends()
+
+
+@pytest.fixture
+def client(monkeypatch, backends):
+    monkeypatch.setattr(llm_client.config, "get_effective_api_key", lambda: "sk-test")
+    monkeypatch.setattr(llm_client.config, "LOCAL_LLM_BASE_URL", None)
+    monkeypatch.setattr(llm_client.config, "LLM_HEDGING_ENABLED", False)
+    monkeypatch.setattr(llm_client, "GRADIO_AVAILABLE", True)
+    monkeypatch.setattr(llm_client, "backend_router", BackendRouter(failure_threshold=3, open_seconds=0.2))
+    monkeypatch.setattr(llm_client, "retry_policy", RetryPolicy(max_attempts=1))
+    monkeypatch.setattr(llm_client, "response_cache", ResponseCache(max_entries=64))
+    monkeypatch.setattr(llm_client, "single_flight", SingleFlight())
+    monkeypatch.setattr(llm_client, "_validation_cache", {})
+    llm_client._cache_validation("sk-test", True)
+
+    client = LLMClient()
+    monkeypatch.setattr(client, "_complete_on", backends.complete_on)
+    monkeypatch.setattr(client, "_stream_on", backends.stream_on)
+    return client
+
+
+def stream_correction(client, answer):
+    async def consume():
+        return "".join([delta async for delta in client.stream_correction(answer, QUESTION)])
+    return asyncio.run(consume())
+
+
+def test_fallback_answer_is_not_served_after_recovery(client, backends):
+    backends.down.add(BACKEND_OPENAI)
+    assert client.get_correction("Hallo", QUESTION) == "answer from gradio"
+
+    backends.down.clear()
+    assert client.get_correction("Hallo", QUESTION) == "answer from openai"
+    # The preferred backend's answer is cached under its own key
+    assert client.get_correction("Hallo", QUESTION) == "answer from openai"
+    assert backends.calls == [BACKEND_OPENAI, BACKEND_GRADIO, BACKEND_OPENAI]
+
+
+def test_fallback_answer_is_not_served_after_the_circuit_closes(client, backends):
+    backends.down.add(BACKEND_OPENAI)
+    for answer in ("Hallo", "Hoi", "Dag"):
+        assert client.get_correction(answer, QUESTION) == "answer from gradio"
+    assert llm_client.backend_router.snapshot()[BACKEND_OPENAI]["state"] == "open"
+
+    # While the circuit is open, answers come from (and are cached for) the fallback
+    assert client.get_correction("Hallo", QUESTION) == "answer from gradio"
+    assert backends.calls.count(BACKEND_GRADIO) == 3
+
+    backends.down.clear()
+    time.sleep(0.25)
+    assert client.get_correction("Hallo", QUESTION) == "answer from openai"
+    assert llm_client.backend_router.snapshot()[BACKEND_OPENAI]["state"] == "closed"
+
+
+def test_streamed_fallback_answer_is_not_served_after_recovery(client, backends):
+    backends.down.add(BACKEND_OPENAI)
+    assert stream_correction(client, "Hallo") == "answer from gradio"
+
+    backends.down.clear()
+    assert stream_correction(client, "Hallo") == "answer from openai"
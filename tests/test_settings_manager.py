@@ -0,0 +1,63 @@
+"""Saving an API key validates it exactly once."""
+import os
+import sys
+import time
+
+import flet as ft
+import pytest
+
+import src.llm_client as llm_client
+from src.llm_client import LLMClient
+from src.managers.settings_manager import SettingsManager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import mock_llm_server  # noqa: E402
+
+
+class FakePage:
+    def update(self):
+        pass
+
+
+@pytest.fixture
+def mock_server():
+    # Every request fails with a 503: validation can't tell whether the key works
+    server, url = mock_llm_server.start_in_background(["--latency", "fixed:0", "--error-rate", "1", "--error-status", "503"])
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def settings(monkeypatch, mock_server):
+    _, url = mock_server
+    saved = {}
+    monkeypatch.setattr(llm_client.config, "BASE_URL", url)
+    monkeypatch.setattr(llm_client.config, "LOCAL_LLM_BASE_URL", None)
+    monkeypatch.setattr(llm_client.config, "API_KEY_REVALIDATE_DELAY", 0.5)
+    monkeypatch.setattr(llm_client.config, "get_effective_api_key", lambda: saved.get("key"))
+    monkeypatch.setattr(llm_client.config, "save_user_api_key", lambda key: saved.update(key=key))
+    monkeypatch.setattr(llm_client.config, "update_runtime_api_key", lambda key: None)
+    monkeypatch.setattr(llm_client, "_validation_cache", {})
+    monkeypatch.setattr(llm_client, "GRADIO_AVAILABLE", False)
+    client = LLMClient()
+    yield SettingsManager(client, FakePage()), client
+    # Stop the background recheck
+    client._validation_generation += 1
+
+
+def test_inconclusive_validation_is_not_repeated_on_save(settings, mock_server):
+    manager, client = settings
+    server, _ = mock_server
+    status = ft.Text()
+
+    manager.save_api_key("sk-new", status)
+
+    assert client.validation_pending
+    assert client.using_deepseek
+    assert status.color == ft.Colors.ORANGE
+    time.sleep(0.2)
+    assert server.RequestHandlerClass.behaviour.stats["requests"] == 1
+    # The background recheck asks again only after API_KEY_REVALIDATE_DELAY
+    time.sleep(0.6)
+    assert server.RequestHandlerClass.behaviour.stats["requests"] == 2